@@ -0,0 +1,177 @@
+from datetime import datetime
+from typing import Optional
+
+from beanie import PydanticObjectId, UpdateResponse
+from fastapi import HTTPException
+from pymongo import UpdateOne
+
+from v1.models.application import ApplicationDoc, ApplicationStatus
+from v1.schemas.application import ApplicationState
+
+# every allowed edge: the statuses it may start from and the one it ends in
+TRANSITIONS = {
+    "assign": ({ApplicationStatus.AWAITING_OPERATOR}, ApplicationStatus.PENDING),
+    "deassign": ({ApplicationStatus.PENDING}, ApplicationStatus.AWAITING_OPERATOR),
+    "request_data": ({ApplicationStatus.PENDING}, ApplicationStatus.AWAITING_DATA),
+    "submit_data": ({ApplicationStatus.AWAITING_DATA}, ApplicationStatus.PENDING),
+    "approve": ({ApplicationStatus.PENDING}, ApplicationStatus.APPROVED),
+    "reject": ({ApplicationStatus.PENDING}, ApplicationStatus.REJECTED),
+    "cancel": (
+        {
+            ApplicationStatus.AWAITING_OPERATOR,
+            ApplicationStatus.PENDING,
+            ApplicationStatus.AWAITING_DATA,
+            ApplicationStatus.CANCELLED,
+        },
+        ApplicationStatus.CANCELLED,
+    ),
+}
+
+
+def transition_query(
+    application_id: PydanticObjectId,
+    edge: str,
+    filters: Optional[dict] = None,
+    changes: Optional[dict] = None,
+    modified_at: Optional[datetime] = None,
+    now: Optional[datetime] = None,
+) -> tuple[dict, dict]:
+    """Filter and update of one edge, the status is the precondition"""
+    sources, target = TRANSITIONS[edge]
+    query = {
+        "_id": application_id,
+        **(filters or {}),
+        "status": {"$in": [status.value for status in sources]},
+    }
+    if modified_at:
+        query["modified_at"] = modified_at
+
+    update = {
+        "$set": {
+            **(changes or {}),
+            "status": target.value,
+            "modified_at": now or datetime.now(),
+        }
+    }
+    return query, update
+
+
+async def transition(
+    application_id: PydanticObjectId,
+    edge: str,
+    filters: Optional[dict] = None,
+    changes: Optional[dict] = None,
+    modified_at: Optional[datetime] = None,
+) -> ApplicationDoc:
+    """
+    Moves an application along `edge` in a single find_one_and_update, setting
+    only the status, modified_at and `changes`. `filters` narrows the
+    application (e.g. to its owner), `modified_at` of an earlier read makes
+    the update fail if the application changed since.
+    Raises 404 if there is no such application and 409 if the edge does not
+    start from its status or it was changed meanwhile.
+    """
+    query, update = transition_query(
+        application_id, edge, filters, changes, modified_at
+    )
+    application = await ApplicationDoc.find_one(query).update(
+        update, response_type=UpdateResponse.NEW_DOCUMENT
+    )
+    if application:
+        return application
+
+    # only a failed transition pays for this read
+    current = await ApplicationDoc.find_one(
+        {"_id": application_id, **(filters or {})}, projection_model=ApplicationState
+    )
+    if not current:
+        raise HTTPException(404, "Application not found")
+
+    sources, _ = TRANSITIONS[edge]
+    if current.status not in sources:
+        raise HTTPException(
+            409,
+            f"Application is {current.status.value}, can not {edge.replace('_', ' ')}",
+        )
+    raise HTTPException(409, "Application was changed meanwhile, try again")
+
+
+async def bulk_transition(
+    edge: str,
+    ids: Optional[list[PydanticObjectId]] = None,
+    filters: Optional[dict] = None,
+    changes: Optional[dict] = None,
+    limit: int = 0,
+) -> tuple[dict[str, int], list[ApplicationState]]:
+    """
+    Moves many applications, given by `ids` or matching `filters` (oldest
+    first, at most `limit`), along `edge` with one read and one bulk_write.
+    Returns a status code per application id (200, 404 or 409)
+    and the applications that were moved.
+    """
+    sources, target = TRANSITIONS[edge]
+    source_values = [status.value for status in sources]
+
+    if ids is not None:
+        query = {"_id": {"$in": ids}}
+    else:
+        query = {"$and": [filters or {}, {"status": {"$in": source_values}}]}
+
+    current = (
+        await ApplicationDoc.find(query, projection_model=ApplicationState)
+        .sort("created_at")
+        .limit(limit)
+        .to_list()
+    )
+
+    results = {str(id): 404 for id in ids or []}
+    eligible = []
+    for application in current:
+        if application.status in sources:
+            eligible.append(application)
+        else:
+            results[str(application.id)] = 409
+
+    if not eligible:
+        return results, []
+
+    # one marker for the whole batch, at the millisecond precision Mongo stores
+    now = datetime.now()
+    now = now.replace(microsecond=now.microsecond // 1000 * 1000)
+
+    result = await ApplicationDoc.get_motor_collection().bulk_write(
+        [
+            UpdateOne(
+                *transition_query(
+                    application.id,
+                    edge,
+                    changes=changes,
+                    modified_at=application.modified_at,
+                    now=now,
+                )
+            )
+            for application in eligible
+        ],
+        ordered=False,
+    )
+
+    moved = eligible
+    if result.matched_count != len(eligible):
+        # a bulk result has no per operation outcome, our marker tells them apart
+        after = await ApplicationDoc.find(
+            {"_id": {"$in": [application.id for application in eligible]}},
+            projection_model=ApplicationState,
+        ).to_list()
+        ours = {
+            application.id
+            for application in after
+            if application.status == target and application.modified_at == now
+        }
+        moved = [application for application in eligible if application.id in ours]
+
+    for application in eligible:
+        results[str(application.id)] = 409
+    for application in moved:
+        results[str(application.id)] = 200
+
+    return results, moved
@@ -0,0 +1,163 @@
+import heapq
+import time
+from collections import deque
+from datetime import datetime
+
+from pymongo import ASCENDING, ReturnDocument
+
+from app.core.config import settings
+from app.core.notification_outbox import notification_outbox
+from app.core.periodic import PeriodicTask
+from v1.models.application import ApplicationDoc, ApplicationStatus
+from v1.models.notification import Notification
+from v1.models.user import StaffMembership
+
+# window of the reported assignment throughput
+THROUGHPUT_WINDOW = 300
+
+
+class AutoAssigner(PeriodicTask):
+    """
+    Assigns the oldest AWAITING_OPERATOR applications to staff members,
+    always to the one with the fewest PENDING applications relative to
+    their level. Each application is claimed with a conditional
+    find_one_and_update, so any number of workers may run it at once.
+    """
+
+    def __init__(
+        self,
+        interval: float,
+        batch_size: int,
+        min_level: int,
+        max_level: int,
+        max_pending: int,
+    ):
+        super().__init__("auto-assign", interval, self.assign)
+        self.batch_size = batch_size
+        self.min_level = min_level
+        self.max_level = max_level
+        self.max_pending = max_pending
+        self.assigned = 0
+        self.queue_depth = None
+        self.oldest_waiting_seconds = None
+        self._recent: deque[tuple[float, int]] = deque()
+
+    async def _operator_loads(self) -> list[tuple[float, str, int, StaffMembership]]:
+        operators = await StaffMembership.find(
+            {"level": {"$gte": self.min_level, "$lte": self.max_level}}
+        ).to_list()
+        if not operators:
+            return []
+
+        pending = {
+            row["_id"]: row["count"]
+            async for row in ApplicationDoc.get_motor_collection().aggregate(
+                [
+                    {
+                        "$match": {
+                            "operator_id": {
+                                "$in": [operator.user_id for operator in operators]
+                            },
+                            "status": ApplicationStatus.PENDING.value,
+                        }
+                    },
+                    {"$group": {"_id": "$operator_id", "count": {"$sum": 1}}},
+                ]
+            )
+        }
+
+        # (load per level, tie breaker, pending, operator id)
+        return [
+            (
+                pending.get(operator.user_id, 0) / operator.level.value,
+                str(operator.user_id),
+                pending.get(operator.user_id, 0),
+                operator,
+            )
+            for operator in operators
+        ]
+
+    async def _claim(self, operator_id) -> dict | None:
+        now = datetime.now()
+        return await ApplicationDoc.get_motor_collection().find_one_and_update(
+            {"status": ApplicationStatus.AWAITING_OPERATOR.value},
+            {
+                "$set": {
+                    "operator_id": operator_id,
+                    "status": ApplicationStatus.PENDING.value,
+                    "modified_at": now,
+                }
+            },
+            sort=[("created_at", ASCENDING)],
+            projection={"_id": 1, "user_id": 1},
+            return_document=ReturnDocument.AFTER,
+        )
+
+    async def _measure_queue(self):
+        collection = ApplicationDoc.get_motor_collection()
+        waiting = {"status": ApplicationStatus.AWAITING_OPERATOR.value}
+
+        self.queue_depth = await collection.count_documents(waiting)
+        oldest = await collection.find_one(
+            waiting, {"created_at": 1}, sort=[("created_at", ASCENDING)]
+        )
+        self.oldest_waiting_seconds = (
+            (datetime.now() - oldest["created_at"]).total_seconds() if oldest else 0
+        )
+
+    async def assign(self) -> int:
+        heap = await self._operator_loads()
+        heapq.heapify(heap)
+
+        notifications = []
+        while heap and len(notifications) < self.batch_size:
+            _, tie, pending, operator = heapq.heappop(heap)
+            if self.max_pending and pending >= self.max_pending:
+                continue
+
+            application = await self._claim(operator.user_id)
+            if not application:
+                break
+
+            notifications.append(
+                Notification(
+                    user_id=application["user_id"],
+                    template="application_assigned",
+                    params={"application_id": str(application["_id"])},
+                    created_at=datetime.now(),
+                )
+            )
+            pending += 1
+            heapq.heappush(
+                heap, (pending / operator.level.value, tie, pending, operator)
+            )
+
+        await notification_outbox.put(*notifications)
+
+        self.assigned += len(notifications)
+        now = time.monotonic()
+        self._recent.append((now, len(notifications)))
+        while self._recent and self._recent[0][0] < now - THROUGHPUT_WINDOW:
+            self._recent.popleft()
+
+        await self._measure_queue()
+        return len(notifications)
+
+    def stats(self) -> dict:
+        return {
+            **super().stats(),
+            "assigned": self.assigned,
+            "assigned_per_minute": sum(count for _, count in self._recent)
+            / (THROUGHPUT_WINDOW / 60),
+            "queue_depth": self.queue_depth,
+            "oldest_waiting_seconds": self.oldest_waiting_seconds,
+        }
+
+
+auto_assigner = AutoAssigner(
+    interval=settings.AUTO_ASSIGN_INTERVAL,
+    batch_size=settings.AUTO_ASSIGN_BATCH,
+    min_level=settings.AUTO_ASSIGN_MIN_LEVEL,
+    max_level=settings.AUTO_ASSIGN_MAX_LEVEL,
+    max_pending=settings.AUTO_ASSIGN_MAX_PENDING,
+)
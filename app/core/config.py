@@ -1,6 +1,7 @@
-from typing import List, Union
+import os
+from typing import List, Literal, Optional, Union
 
-from pydantic import AnyHttpUrl, validator
+from pydantic import AnyHttpUrl, model_validator, validator
 from pydantic_settings import BaseSettings
 
 
@@ -13,6 +14,92 @@ class Settings(BaseSettings):
     SECRET_KEY: str
     SALT_SECRET_KEY: str
 
+    # MongoDB connection pool, per worker process; None keeps the driver
+    # default. Compressors are a comma separated list, e.g. "zstd,snappy"
+    MONGO_MAX_POOL_SIZE: int = 100
+    MONGO_MIN_POOL_SIZE: int = 0
+    MONGO_MAX_IDLE_TIME_MS: Optional[int] = None
+    MONGO_WAIT_QUEUE_TIMEOUT_MS: Optional[int] = None
+    MONGO_SERVER_SELECTION_TIMEOUT_MS: int = 30_000
+    MONGO_COMPRESSORS: str = ""
+    MONGO_APP_NAME: Optional[str] = None
+
+    # Authorized-device session cache
+    SESSION_CACHE_SIZE: int = 10_000
+    SESSION_CACHE_TTL: int = 60
+
+    # bcrypt worker pool, "thread" or "process"
+    PASSWORD_HASH_EXECUTOR: str = "thread"
+    PASSWORD_HASH_WORKERS: int = 4
+
+    # Signin throttling, token buckets per email and per client IP
+    SIGNIN_EMAIL_BURST: int = 5
+    SIGNIN_EMAIL_PER_MINUTE: float = 5
+    SIGNIN_IP_BURST: int = 30
+    SIGNIN_IP_PER_MINUTE: float = 30
+    SIGNIN_BACKOFF_BASE_SECONDS: float = 1
+    SIGNIN_BACKOFF_MAX_SECONDS: float = 300
+    SIGNIN_THROTTLE_CACHE_SIZE: int = 100_000
+
+    # Cursor pagination of list endpoints
+    PAGE_DEFAULT_LIMIT: int = 50
+    PAGE_MAX_LIMIT: int = 200
+
+    # Streaming exports
+    EXPORT_BATCH_SIZE: int = 500
+
+    # Most applications one bulk staff request may change
+    APPLICATION_BULK_MAX_ITEMS: int = 1000
+
+    # Seconds a computed staff queue dashboard is served from memory
+    DASHBOARD_CACHE_TTL: float = 5
+
+    # Automatic assignment of waiting applications to staff between the
+    # two levels, weighted by level, 0 disables it (or the pending cap)
+    AUTO_ASSIGN_INTERVAL: float = 0
+    AUTO_ASSIGN_BATCH: int = 100
+    AUTO_ASSIGN_MIN_LEVEL: int = 50
+    AUTO_ASSIGN_MAX_LEVEL: int = 100
+    AUTO_ASSIGN_MAX_PENDING: int = 0
+
+    # Seconds between version checks of the in-memory service catalog
+    SERVICE_CATALOG_CHECK_INTERVAL: float = 30
+
+    # Staff membership cache
+    MEMBERSHIP_CACHE_SIZE: int = 10_000
+    MEMBERSHIP_CACHE_TTL: int = 10
+
+    # Expired confirmation tokens are removed by a TTL index,
+    # the sweeper is an optional faster cleanup, 0 disables it
+    CONFIRMATION_TOKEN_SWEEP_INTERVAL: float = 0
+    CONFIRMATION_TOKEN_SWEEP_BATCH: int = 1000
+
+    # "objectid" tokens are stored in Mongo, "signed" tokens are EdDSA JWS
+    # verifiable without a database read, signed by an Ed25519 PEM key
+    CONFIRMATION_TOKEN_MODE: Literal["objectid", "signed"] = "objectid"
+    CONFIRMATION_TOKEN_SIGNING_KEY_FILE: Optional[str] = None
+
+    # Write-behind notification outbox
+    NOTIFICATION_OUTBOX_BATCH_SIZE: int = 200
+    NOTIFICATION_OUTBOX_FLUSH_INTERVAL: float = 0.5
+    NOTIFICATION_OUTBOX_MAX_SIZE: int = 10_000
+
+    # Server-Sent Events notification stream. A resumed stream replays from
+    # the outbox flush interval plus this slack before Last-Event-ID, ids are
+    # assigned when queued and are not in insert order across workers
+    NOTIFICATION_STREAM_QUEUE_SIZE: int = 100
+    NOTIFICATION_STREAM_HEARTBEAT: float = 15
+    NOTIFICATION_STREAM_REPLAY_LIMIT: int = 500
+    NOTIFICATION_STREAM_REPLAY_SLACK: float = 5
+
+    # Notifications older than the retention are deleted, read ones older
+    # than the rollup age are merged into one per user, 0 disables either.
+    # The janitor deletes data, so it only runs when an interval is set
+    NOTIFICATION_RETENTION_DAYS: int = 180
+    NOTIFICATION_ROLLUP_DAYS: int = 30
+    NOTIFICATION_JANITOR_INTERVAL: float = 0
+    NOTIFICATION_JANITOR_BATCH: int = 1000
+
     @validator("BACKEND_CORS_ORIGINS", pre=True)
     def assemble_cors_origins(cls, v: Union[str, List[str]]) -> Union[List[str], str]:
         if isinstance(v, str) and not v.startswith("["):
@@ -21,6 +108,22 @@ class Settings(BaseSettings):
             return v
         raise ValueError(v)
 
+    @model_validator(mode="after")
+    def check_confirmation_token_signing_key(self) -> "Settings":
+        if self.CONFIRMATION_TOKEN_MODE != "signed":
+            return self
+        if not self.CONFIRMATION_TOKEN_SIGNING_KEY_FILE:
+            raise ValueError(
+                "CONFIRMATION_TOKEN_MODE=signed requires "
+                "CONFIRMATION_TOKEN_SIGNING_KEY_FILE"
+            )
+        if not os.path.isfile(self.CONFIRMATION_TOKEN_SIGNING_KEY_FILE):
+            raise ValueError(
+                "CONFIRMATION_TOKEN_SIGNING_KEY_FILE does not exist: "
+                f"{self.CONFIRMATION_TOKEN_SIGNING_KEY_FILE}"
+            )
+        return self
+
     class Config:
         case_sensitive = True
         env_file = ".env"
@@ -0,0 +1,125 @@
+import asyncio
+import time
+from datetime import datetime
+from typing import Optional
+
+from app.core.config import settings
+from app.core.service_catalog import service_catalog
+from v1.models.application import ApplicationDoc, ApplicationStatus
+
+DASHBOARD_PIPELINE = [
+    {
+        "$facet": {
+            "counts": [
+                {
+                    "$group": {
+                        "_id": {
+                            "status": "$status",
+                            "service_document_id": "$service_document_id",
+                        },
+                        "count": {"$sum": 1},
+                    }
+                }
+            ],
+            "operator_load": [
+                {"$match": {"status": ApplicationStatus.PENDING.value}},
+                {"$group": {"_id": "$operator_id", "pending": {"$sum": 1}}},
+                {"$sort": {"pending": -1}},
+            ],
+            "oldest": [
+                {"$group": {"_id": "$status", "created_at": {"$min": "$created_at"}}}
+            ],
+        }
+    }
+]
+
+
+class QueueDashboard:
+    """
+    Application queue overview computed by one $facet aggregation and kept
+    for `ttl` seconds. Concurrent requests on an expired dashboard wait for
+    a single refresh instead of each running the aggregation.
+    """
+
+    def __init__(self, ttl: float):
+        self.ttl = ttl
+        self._data: Optional[dict] = None
+        self._computed_at = 0.0
+        self._lock = asyncio.Lock()
+        self.hits = 0
+        self.refreshes = 0
+        self.last_duration = 0.0
+
+    def _fresh(self) -> bool:
+        return (
+            self._data is not None and time.monotonic() - self._computed_at < self.ttl
+        )
+
+    async def _compute(self) -> dict:
+        started = time.perf_counter()
+        result = await ApplicationDoc.aggregate(DASHBOARD_PIPELINE).to_list()
+        facets = result[0] if result else {}
+
+        names = {document.id: document.name for document in await service_catalog.all()}
+        counts = [
+            {
+                "status": row["_id"]["status"],
+                "service_document_id": str(row["_id"]["service_document_id"]),
+                "service_name": names.get(row["_id"]["service_document_id"]),
+                "count": row["count"],
+            }
+            for row in facets.get("counts", [])
+        ]
+        totals = {status.value: 0 for status in ApplicationStatus}
+        for row in counts:
+            totals[row["status"]] = totals.get(row["status"], 0) + row["count"]
+
+        self.refreshes += 1
+        self.last_duration = time.perf_counter() - started
+        return {
+            "generated_at": datetime.now(),
+            "totals": totals,
+            "counts": counts,
+            "operator_load": [
+                {"operator_id": str(row["_id"]), "pending": row["pending"]}
+                for row in facets.get("operator_load", [])
+            ],
+            "oldest": {
+                row["_id"]: row["created_at"] for row in facets.get("oldest", [])
+            },
+        }
+
+    async def get(self) -> dict:
+        if self._fresh():
+            self.hits += 1
+        else:
+            async with self._lock:
+                if self._fresh():
+                    self.hits += 1
+                else:
+                    self._data = await self._compute()
+                    self._computed_at = time.monotonic()
+
+        # ages move on while the rest is served from memory
+        now = datetime.now()
+        return {
+            **self._data,
+            "oldest": {
+                status: {
+                    "created_at": created_at,
+                    "age_seconds": (now - created_at).total_seconds(),
+                }
+                for status, created_at in self._data["oldest"].items()
+            },
+        }
+
+    def stats(self) -> dict:
+        return {
+            "ttl": self.ttl,
+            "hits": self.hits,
+            "refreshes": self.refreshes,
+            "last_duration": self.last_duration,
+        }
+
+
+queue_dashboard = QueueDashboard(ttl=settings.DASHBOARD_CACHE_TTL)
@@ -1,7 +1,136 @@
+import threading
+import time
+from typing import Optional
+
 import motor.motor_asyncio
+from pymongo import monitoring
+
 from app.core.config import settings
 
-client = motor.motor_asyncio.AsyncIOMotorClient(
-    settings.DATABASE_URL, uuidRepresentation="standard"
-)
-db = client[settings.DATABASE_NAME]
+
+class PoolStats(monitoring.ConnectionPoolListener):
+    """
+    Connection pool events of the Mongo client. Checkout waits are timed
+    here, pymongo runs a checkout start and its outcome on the same thread.
+    """
+
+    def __init__(self):
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self.checkouts = 0
+        self.checkout_failures = 0
+        self.wait_seconds = 0.0
+        self.max_wait_seconds = 0.0
+        self.checked_out = 0
+        self.connections_created = 0
+        self.connections_closed = 0
+
+    def _waited(self) -> float:
+        started = getattr(self._local, "started", None)
+        self._local.started = None
+        return time.perf_counter() - started if started else 0.0
+
+    def connection_check_out_started(self, event):
+        self._local.started = time.perf_counter()
+
+    def connection_checked_out(self, event):
+        waited = self._waited()
+        with self._lock:
+            self.checkouts += 1
+            self.checked_out += 1
+            self.wait_seconds += waited
+            self.max_wait_seconds = max(self.max_wait_seconds, waited)
+
+    def connection_check_out_failed(self, event):
+        waited = self._waited()
+        with self._lock:
+            self.checkout_failures += 1
+            self.max_wait_seconds = max(self.max_wait_seconds, waited)
+
+    def connection_checked_in(self, event):
+        with self._lock:
+            self.checked_out -= 1
+
+    def connection_created(self, event):
+        with self._lock:
+            self.connections_created += 1
+
+    def connection_closed(self, event):
+        with self._lock:
+            self.connections_closed += 1
+
+    def pool_created(self, event):
+        pass
+
+    def pool_ready(self, event):
+        pass
+
+    def pool_cleared(self, event):
+        pass
+
+    def pool_closed(self, event):
+        pass
+
+    def connection_ready(self, event):
+        pass
+
+    def stats(self) -> dict:
+        return {
+            "max_pool_size": settings.MONGO_MAX_POOL_SIZE,
+            "min_pool_size": settings.MONGO_MIN_POOL_SIZE,
+            "open_connections": self.connections_created - self.connections_closed,
+            "checked_out": self.checked_out,
+            "checkouts": self.checkouts,
+            "checkout_failures": self.checkout_failures,
+            "avg_wait_seconds": self.wait_seconds / self.checkouts
+            if self.checkouts
+            else 0.0,
+            "max_wait_seconds": self.max_wait_seconds,
+        }
+
+
+pool_stats = PoolStats()
+
+client: Optional[motor.motor_asyncio.AsyncIOMotorClient] = None
+db: Optional[motor.motor_asyncio.AsyncIOMotorDatabase] = None
+
+
+def client_options() -> dict:
+    options = {
+        "uuidRepresentation": "standard",
+        "maxPoolSize": settings.MONGO_MAX_POOL_SIZE,
+        "minPoolSize": settings.MONGO_MIN_POOL_SIZE,
+        "serverSelectionTimeoutMS": settings.MONGO_SERVER_SELECTION_TIMEOUT_MS,
+        "appname": settings.MONGO_APP_NAME or settings.PROJECT_NAME,
+        "event_listeners": [pool_stats],
+    }
+    if settings.MONGO_MAX_IDLE_TIME_MS is not None:
+        options["maxIdleTimeMS"] = settings.MONGO_MAX_IDLE_TIME_MS
+    if settings.MONGO_WAIT_QUEUE_TIMEOUT_MS is not None:
+        options["waitQueueTimeoutMS"] = settings.MONGO_WAIT_QUEUE_TIMEOUT_MS
+    if settings.MONGO_COMPRESSORS:
+        options["compressors"] = settings.MONGO_COMPRESSORS
+    return options
+
+
+async def connect() -> motor.motor_asyncio.AsyncIOMotorDatabase:
+    """Creates the client on the running loop and checks the server is reachable"""
+    global client, db
+
+    client = motor.motor_asyncio.AsyncIOMotorClient(
+        settings.DATABASE_URL, **client_options()
+    )
+    db = client[settings.DATABASE_NAME]
+
+    # fail at startup, not on the first request
+    await client.admin.command("ping")
+    return db
+
+
+def close():
+    global client, db
+
+    if client is not None:
+        client.close()
+    client = None
+    db = None
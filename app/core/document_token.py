@@ -0,0 +1,112 @@
+import base64
+import hashlib
+import time
+from datetime import timedelta
+from functools import cached_property
+from typing import Optional
+
+import jwt
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric.ed25519 import Ed25519PrivateKey
+from fastapi import HTTPException
+from jwt.algorithms import OKPAlgorithm
+from pydantic import ValidationError
+
+from app.core.config import settings
+from app.core.service_catalog import service_catalog
+from v1.models.document import ApexDocument
+from v1.schemas.document import PublicCard
+
+
+async def build_public_card(document: Optional[ApexDocument]) -> Optional[PublicCard]:
+    """Stored card of a document, or one built from its data for older documents"""
+    if not document:
+        return None
+    if document.public_card:
+        return document.public_card
+
+    service_document = await service_catalog.get(document.service_id)
+    try:
+        return PublicCard.build(document.id, service_document.name, document.data)
+    except (AttributeError, KeyError, TypeError, ValidationError):
+        return None
+
+
+class DocumentTokenSigner:
+    """
+    Issues and checks stateless confirmation tokens: EdDSA signed JWS carrying
+    the document id, expiry and public card. The public key is published so
+    relying parties can verify tokens offline.
+    """
+
+    algorithm = "EdDSA"
+
+    def __init__(self, key_file: Optional[str]):
+        self.key_file = key_file
+        self._private_key: Optional[Ed25519PrivateKey] = None
+
+    @property
+    def enabled(self) -> bool:
+        return bool(self.key_file)
+
+    @property
+    def private_key(self) -> Ed25519PrivateKey:
+        if self._private_key is None:
+            if not self.key_file:
+                raise RuntimeError("CONFIRMATION_TOKEN_SIGNING_KEY_FILE is not set")
+            with open(self.key_file, "rb") as key_file:
+                self._private_key = serialization.load_pem_private_key(
+                    key_file.read(), password=None
+                )
+        return self._private_key
+
+    @cached_property
+    def key_id(self) -> str:
+        raw = self.private_key.public_key().public_bytes(
+            serialization.Encoding.Raw, serialization.PublicFormat.Raw
+        )
+        digest = hashlib.sha256(raw).digest()[:12]
+        return base64.urlsafe_b64encode(digest).decode().rstrip("=")
+
+    def issue(self, card: PublicCard, lifetime: timedelta) -> str:
+        return jwt.encode(
+            {
+                "sub": card.document_id,
+                "exp": int(time.time() + lifetime.total_seconds()),
+                "card": card.model_dump(),
+            },
+            self.private_key,
+            algorithm=self.algorithm,
+            headers={"kid": self.key_id},
+        )
+
+    def verify(self, token: str) -> PublicCard:
+        if not self.enabled:
+            raise HTTPException(status_code=400, detail="Invalid token")
+
+        try:
+            claims = jwt.decode(
+                token, self.private_key.public_key(), algorithms=[self.algorithm]
+            )
+            return PublicCard(**claims["card"])
+        except jwt.ExpiredSignatureError:
+            raise HTTPException(status_code=400, detail="Token expired")
+        except (jwt.InvalidTokenError, KeyError, TypeError, ValidationError):
+            raise HTTPException(status_code=400, detail="Invalid token")
+
+    def jwks(self) -> dict:
+        return {
+            "keys": [
+                {
+                    **OKPAlgorithm.to_jwk(self.private_key.public_key(), as_dict=True),
+                    "kid": self.key_id,
+                    "alg": self.algorithm,
+                    "use": "sig",
+                }
+            ]
+        }
+
+
+document_token_signer = DocumentTokenSigner(
+    settings.CONFIRMATION_TOKEN_SIGNING_KEY_FILE
+)
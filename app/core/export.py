@@ -0,0 +1,47 @@
+import csv
+import io
+import json
+from datetime import datetime
+from enum import Enum
+from typing import AsyncIterator
+
+from bson import ObjectId
+
+EXPORT_MEDIA_TYPES = {
+    "ndjson": "application/x-ndjson",
+    "csv": "text/csv",
+}
+
+
+def _plain(value):
+    if isinstance(value, ObjectId):
+        return str(value)
+    if isinstance(value, datetime):
+        return value.isoformat()
+    if isinstance(value, Enum):
+        return value.value
+    return value
+
+
+async def stream_rows(cursor, fields: list[str], format: str) -> AsyncIterator[str]:
+    """
+    Renders raw documents from a Motor cursor one line at a time, so memory
+    stays bounded by the cursor batch size instead of the result size.
+    """
+    if format == "csv":
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+
+        def line(values) -> str:
+            buffer.seek(0)
+            buffer.truncate()
+            writer.writerow(values)
+            return buffer.getvalue()
+
+        yield line(fields)
+        async for row in cursor:
+            yield line([_plain(row.get(field)) for field in fields])
+        return
+
+    async for row in cursor:
+        yield json.dumps({field: _plain(row.get(field)) for field in fields}) + "\n"
@@ -4,6 +4,8 @@ import datetime
 from app.core.config import settings
 
 from fastapi import HTTPException, Header
+from app.core.principal import Principal
+from app.core.session_cache import session_cache
 from v1.models.authorized_device import AuthorizedDevice
 from v1.models.user import UserDoc
 
@@ -27,7 +29,7 @@ class FastJWT:
     async def decode(self, payload):
         return jwt.decode(payload, self.secret_key, algorithms=["HS256"])
 
-    async def login_required(self, Authorization=Header("Authorization")):
+    async def login_required(self, Authorization=Header("Authorization")) -> Principal:
         try:
             if Authorization == "Authorization":
                 raise
@@ -48,14 +50,28 @@ class FastJWT:
             if not jwt_token.get("authorized_device_id"):
                 raise
 
-            authorized_device = await AuthorizedDevice.find_one(
-                {
-                    "_id": PydanticObjectId(jwt_token.get("authorized_device_id")),
-                    "user_id": PydanticObjectId(jwt_token.get("id")),
-                }
+            authorized_device = session_cache.get_device(
+                jwt_token.get("id"), jwt_token.get("authorized_device_id")
             )
             if not authorized_device:
-                raise
+                authorized_device = await AuthorizedDevice.find_one(
+                    {
+                        "_id": PydanticObjectId(jwt_token.get("authorized_device_id")),
+                        "user_id": PydanticObjectId(jwt_token.get("id")),
+                    }
+                )
+                if not authorized_device:
+                    raise
+
+                session_cache.add_device(authorized_device)
 
         except Exception as e:
             raise HTTPException(status_code=401, detail="Unauthorized")
+
+        return Principal(claims=jwt_token, user=user, device=authorized_device)
+
+
+# A single instance keeps the dependency identical everywhere it is declared,
+# so FastAPI resolves it only once per request and shares the result.
+fast_jwt = FastJWT()
+login_required = fast_jwt.login_required
@@ -0,0 +1,30 @@
+from typing import Optional
+
+from beanie import PydanticObjectId
+
+from app.core.cache import TTLCache
+from app.core.config import settings
+from v1.models.user import StaffMembership
+
+_MISSING = object()
+
+# None is cached as well, so non-staff callers do not query on every click
+membership_cache = TTLCache(
+    maxsize=settings.MEMBERSHIP_CACHE_SIZE, ttl=settings.MEMBERSHIP_CACHE_TTL
+)
+
+
+async def get_membership(user_id) -> Optional[StaffMembership]:
+    """Returns the staff membership of a user, cached for a short TTL"""
+    membership = membership_cache.get(str(user_id), _MISSING)
+    if membership is not _MISSING:
+        return membership
+
+    membership = await StaffMembership.find_one({"user_id": PydanticObjectId(user_id)})
+    membership_cache.set(str(user_id), membership)
+
+    return membership
+
+
+def invalidate_membership(user_id):
+    membership_cache.invalidate(str(user_id))
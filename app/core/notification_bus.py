@@ -0,0 +1,78 @@
+import asyncio
+from collections import defaultdict
+from datetime import timedelta
+
+from beanie import PydanticObjectId
+
+from app.core.config import settings
+from v1.models.notification import Notification
+from v1.schemas.notification import NotificationView
+
+
+class NotificationBus:
+    """
+    In-process pub/sub of stored notifications, one queue per open stream.
+    A stream that falls behind loses events instead of blocking publishers;
+    its client catches up from the collection with Last-Event-ID.
+    """
+
+    def __init__(self, queue_size: int):
+        self.queue_size = queue_size
+        self._subscribers: dict[str, set[asyncio.Queue]] = defaultdict(set)
+        self.published = 0
+        self.dropped = 0
+
+    def subscribe(self, user_id) -> asyncio.Queue:
+        queue = asyncio.Queue(maxsize=self.queue_size)
+        self._subscribers[str(user_id)].add(queue)
+        return queue
+
+    def unsubscribe(self, user_id, queue: asyncio.Queue):
+        queues = self._subscribers.get(str(user_id))
+        if queues is None:
+            return
+
+        queues.discard(queue)
+        if not queues:
+            del self._subscribers[str(user_id)]
+
+    def publish(self, notification: Notification):
+        self.published += 1
+        for queue in self._subscribers.get(str(notification.user_id), ()):
+            try:
+                queue.put_nowait(notification)
+            except asyncio.QueueFull:
+                self.dropped += 1
+
+    def stats(self) -> dict:
+        return {
+            "users": len(self._subscribers),
+            "streams": sum(len(queues) for queues in self._subscribers.values()),
+            "published": self.published,
+            "dropped": self.dropped,
+        }
+
+
+def replay_since(last_id: PydanticObjectId) -> PydanticObjectId:
+    """
+    Lowest id a stream resumed after `last_id` replays from. Ids are assigned
+    when a notification is queued, up to a flush before its insert and in any
+    worker, so a lower id may be stored after `last_id` was sent.
+    """
+    lookback = timedelta(
+        seconds=settings.NOTIFICATION_OUTBOX_FLUSH_INTERVAL
+        + settings.NOTIFICATION_STREAM_REPLAY_SLACK
+    )
+    return PydanticObjectId.from_datetime(last_id.generation_time - lookback)
+
+
+def sse_event(notification: Notification) -> str:
+    view = NotificationView.model_validate(notification.model_dump(by_alias=True))
+    return (
+        f"id: {notification.id}\n"
+        "event: notification\n"
+        f"data: {view.model_dump_json(by_alias=True)}\n\n"
+    )
+
+
+notification_bus = NotificationBus(queue_size=settings.NOTIFICATION_STREAM_QUEUE_SIZE)
@@ -0,0 +1,42 @@
+from collections import Counter
+
+from pymongo import UpdateOne
+
+from v1.models.notification import NotificationCounter
+
+
+async def add_unread(counts: Counter):
+    """$inc the unread counters of several users in one bulk write"""
+    if not counts:
+        return
+
+    await NotificationCounter.get_motor_collection().bulk_write(
+        [
+            UpdateOne({"_id": user_id}, {"$inc": {"unread": count}}, upsert=True)
+            for user_id, count in counts.items()
+        ],
+        ordered=False,
+    )
+
+
+async def remove_unread(user_id, count: int):
+    """Lowers the unread counter of a user, never below zero"""
+    if count <= 0:
+        return
+
+    await NotificationCounter.get_motor_collection().update_one(
+        {"_id": user_id},
+        [{"$set": {"unread": {"$max": [0, {"$add": ["$unread", -count]}]}}}],
+        upsert=True,
+    )
+
+
+async def reset_unread(user_id):
+    await NotificationCounter.get_motor_collection().update_one(
+        {"_id": user_id}, {"$set": {"unread": 0}}, upsert=True
+    )
+
+
+async def get_unread(user_id) -> int:
+    counter = await NotificationCounter.get(user_id)
+    return counter.unread if counter else 0
@@ -0,0 +1,133 @@
+from collections import Counter, defaultdict
+from datetime import datetime, timedelta
+
+from pymongo import UpdateOne
+
+from app.core.config import settings
+from app.core.notification_counters import remove_unread
+from app.core.periodic import PeriodicTask
+from v1.models.notification import Notification
+
+
+class NotificationJanitor(PeriodicTask):
+    """
+    Keeps the notifications collection bounded. Read notifications older than
+    `rollup_days` are replaced by a single "rollup" notification per user,
+    anything older than `retention_days` is deleted. Both work in batches
+    over the created_at index.
+    """
+
+    def __init__(
+        self, interval: float, batch_size: int, retention_days: int, rollup_days: int
+    ):
+        super().__init__("notification-janitor", interval, self.sweep)
+        self.batch_size = batch_size
+        self.retention_days = retention_days
+        self.rollup_days = rollup_days
+        self.rolled_up = 0
+        self.deleted = 0
+
+    async def _batches(self, filters: dict):
+        collection = Notification.get_motor_collection()
+        while True:
+            batch = await collection.find(
+                filters, {"_id": 1, "user_id": 1, "created_at": 1, "read_at": 1}
+            ).to_list(self.batch_size)
+            if not batch:
+                return
+
+            yield batch
+            if len(batch) < self.batch_size:
+                return
+
+    async def rollup(self, now: datetime) -> int:
+        collection = Notification.get_motor_collection()
+        rolled_up = 0
+
+        async for batch in self._batches(
+            {
+                "created_at": {"$lt": now - timedelta(days=self.rollup_days)},
+                "created_by": "system",
+                "read_at": {"$ne": None},
+                "template": {"$ne": "rollup"},
+            }
+        ):
+            by_user = defaultdict(list)
+            for notification in batch:
+                by_user[notification["user_id"]].append(notification["created_at"])
+
+            # counted into the rollup first, a crash in between only
+            # leaves the notifications to be counted again
+            await collection.bulk_write(
+                [
+                    UpdateOne(
+                        {"user_id": user_id, "template": "rollup"},
+                        {
+                            "$inc": {"params.count": len(dates)},
+                            "$min": {"params.since": min(dates)},
+                            "$max": {
+                                "params.until": max(dates),
+                                "created_at": max(dates),
+                            },
+                            "$setOnInsert": {
+                                "created_by": "system",
+                                "metadata": {},
+                                "read_at": now,
+                            },
+                        },
+                        upsert=True,
+                    )
+                    for user_id, dates in by_user.items()
+                ],
+                ordered=False,
+            )
+            result = await collection.delete_many(
+                {"_id": {"$in": [notification["_id"] for notification in batch]}}
+            )
+            rolled_up += result.deleted_count
+
+        self.rolled_up += rolled_up
+        return rolled_up
+
+    async def expire(self, now: datetime) -> int:
+        collection = Notification.get_motor_collection()
+        deleted = 0
+
+        async for batch in self._batches(
+            {"created_at": {"$lt": now - timedelta(days=self.retention_days)}}
+        ):
+            result = await collection.delete_many(
+                {"_id": {"$in": [notification["_id"] for notification in batch]}}
+            )
+            deleted += result.deleted_count
+
+            unread = Counter(
+                notification["user_id"]
+                for notification in batch
+                if notification.get("read_at") is None
+            )
+            for user_id, count in unread.items():
+                await remove_unread(user_id, count)
+
+        self.deleted += deleted
+        return deleted
+
+    async def sweep(self) -> dict:
+        now = datetime.now()
+        result = {"rolled_up": 0, "deleted": 0}
+        if self.rollup_days:
+            result["rolled_up"] = await self.rollup(now)
+        if self.retention_days:
+            result["deleted"] = await self.expire(now)
+        return result
+
+    def stats(self) -> dict:
+        return {**super().stats(), "rolled_up": self.rolled_up, "deleted": self.deleted}
+
+
+notification_janitor = NotificationJanitor(
+    interval=settings.NOTIFICATION_JANITOR_INTERVAL,
+    batch_size=settings.NOTIFICATION_JANITOR_BATCH,
+    retention_days=settings.NOTIFICATION_RETENTION_DAYS,
+    rollup_days=settings.NOTIFICATION_ROLLUP_DAYS,
+)
@@ -0,0 +1,174 @@
+import asyncio
+import logging
+import time
+from collections import Counter
+
+from beanie import PydanticObjectId
+from pymongo.errors import BulkWriteError
+
+from app.core.config import settings
+from app.core.notification_bus import notification_bus
+from app.core.notification_counters import add_unread
+from v1.models.notification import Notification
+
+logger = logging.getLogger(__name__)
+
+DUPLICATE_KEY = 11000
+
+
+def negated(counts: Counter) -> Counter:
+    return Counter({key: -count for key, count in counts.items()})
+
+
+class NotificationOutbox:
+    """
+    Write-behind buffer for notifications. Handlers enqueue and return right
+    away, a background task writes the buffer with insert_many once it holds
+    `batch_size` notifications or every `flush_interval` seconds.
+    Ids are assigned on enqueue so a retried batch can not insert twice.
+    """
+
+    def __init__(self, batch_size: int, flush_interval: float, max_size: int):
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.max_size = max_size
+        self._buffer: list[Notification] = []
+        self._wakeup = asyncio.Event()
+        self._task: asyncio.Task | None = None
+        self.enqueued = 0
+        self.written = 0
+        self.flushes = 0
+        self.failures = 0
+        self.last_flush_seconds = 0.0
+        self.max_flush_seconds = 0.0
+
+    async def put(self, *notifications: Notification):
+        if not notifications:
+            return
+
+        for notification in notifications:
+            if notification.id is None:
+                notification.id = PydanticObjectId()
+        self.enqueued += len(notifications)
+
+        # not running (e.g. scripts) or backlogged: write through
+        if self._task is None or len(self._buffer) >= self.max_size:
+            await self._write(list(notifications))
+            return
+
+        self._buffer.extend(notifications)
+        if len(self._buffer) >= self.batch_size:
+            self._wakeup.set()
+
+    async def _write(self, batch: list[Notification]):
+        # counted before the insert, so a mark-read that lands between the two
+        # writes can not leave the counter above the unread notifications
+        counts = Counter(notification.user_id for notification in batch)
+        await add_unread(counts)
+
+        started = time.perf_counter()
+        try:
+            await Notification.insert_many(batch, ordered=False)
+            self.written += len(batch)
+            failed = set()
+        except BulkWriteError as e:
+            # duplicate ids of a retried batch are already stored, their count
+            # was taken back when the earlier attempt failed
+            self.written += e.details.get("nInserted", 0)
+            failed = {
+                error["index"]
+                for error in e.details.get("writeErrors", [])
+                if error.get("code") != DUPLICATE_KEY
+            }
+            logger.warning("Notification batch partially failed: %s", e.details)
+        except BaseException:
+            # the batch will be retried, take its count back meanwhile
+            try:
+                await add_unread(negated(counts))
+            except Exception:
+                logger.exception("Unread counters update failed")
+            raise
+        finally:
+            self.flushes += 1
+            self.last_flush_seconds = time.perf_counter() - started
+            self.max_flush_seconds = max(
+                self.max_flush_seconds, self.last_flush_seconds
+            )
+
+        stored = [
+            notification
+            for index, notification in enumerate(batch)
+            if index not in failed
+        ]
+
+        # the batch is stored, a failure here must not make it retry
+        if failed:
+            try:
+                await add_unread(
+                    negated(Counter(batch[index].user_id for index in failed))
+                )
+            except Exception:
+                logger.exception("Unread counters update failed")
+
+        # only once stored, so a stream can always resume from the collection
+        for notification in stored:
+            notification_bus.publish(notification)
+
+    async def flush(self):
+        while self._buffer:
+            batch = self._buffer[: self.batch_size]
+            del self._buffer[: self.batch_size]
+            try:
+                await self._write(batch)
+            except asyncio.CancelledError:
+                self._buffer[:0] = batch
+                raise
+            except Exception:
+                # keep the batch and retry on the next tick
+                self.failures += 1
+                self._buffer[:0] = batch
+                logger.exception("Notification flush failed")
+                return
+
+    async def _loop(self):
+        while True:
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), self.flush_interval)
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+            await self.flush()
+
+    def start(self):
+        if self._task is None:
+            self._task = asyncio.create_task(self._loop(), name="notification-outbox")
+
+    async def stop(self):
+        """Stops the background task and drains whatever is still buffered"""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+        await self.flush()
+
+    def stats(self) -> dict:
+        return {
+            "queue_depth": len(self._buffer),
+            "enqueued": self.enqueued,
+            "written": self.written,
+            "flushes": self.flushes,
+            "failures": self.failures,
+            "last_flush_seconds": self.last_flush_seconds,
+            "max_flush_seconds": self.max_flush_seconds,
+        }
+
+
+notification_outbox = NotificationOutbox(
+    batch_size=settings.NOTIFICATION_OUTBOX_BATCH_SIZE,
+    flush_interval=settings.NOTIFICATION_OUTBOX_FLUSH_INTERVAL,
+    max_size=settings.NOTIFICATION_OUTBOX_MAX_SIZE,
+)
@@ -0,0 +1,27 @@
+from typing import Optional
+
+# notifications store one of these keys and its params, the text is
+# rendered on read so every document only carries what differs
+NOTIFICATION_TEMPLATES = {
+    "welcome": "Welcome to the platform",
+    "device_signed_in": "New device signed in to your account, DeviceID: {device_id}",
+    "application_created": "Application 'REF_{application_id}' created",
+    "application_assigned": "Application 'REF_{application_id}' assigned to operator",
+    "application_deassigned": "Application 'REF_{application_id}' deassigned from operator",
+    "application_status": "Application 'REF_{application_id}' is {status}. Message: '{message}'",
+    "application_status_no_message": "Application 'REF_{application_id}' is {status}. Message: 'Has no message from operator'",
+    "application_data_updated": "Application 'REF_{application_id}' data updated. Field: {field} Value: {value}",
+    "application_missing_data": "Please fill the missing fields in the application 'REF_{application_id}' data: {missing_fields}",
+    "document_issued": "Congratulations! Your application for '{service_name}' is approved. Your 'DOC_{document_id}' is ready.",
+    "rollup": "{count} older notifications from {since:%Y-%m-%d} to {until:%Y-%m-%d}",
+}
+
+
+def render(template: Optional[str], params: Optional[dict]) -> Optional[str]:
+    if template not in NOTIFICATION_TEMPLATES:
+        return None
+
+    try:
+        return NOTIFICATION_TEMPLATES[template].format_map(params or {})
+    except (KeyError, ValueError, TypeError):
+        return NOTIFICATION_TEMPLATES[template]
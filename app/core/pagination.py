@@ -0,0 +1,93 @@
+import base64
+import json
+from datetime import datetime
+from typing import Generic, Optional, Type, TypeVar
+
+from beanie import Document, PydanticObjectId
+from fastapi import HTTPException, Query
+from pydantic import BaseModel
+from pymongo import DESCENDING
+
+from app.core.config import settings
+
+T = TypeVar("T")
+
+# every paginated collection has an index ending in these keys
+PAGE_SORT = [("created_at", DESCENDING), ("_id", DESCENDING)]
+
+
+def encode_cursor(created_at: datetime, id: PydanticObjectId) -> str:
+    raw = json.dumps([created_at.isoformat(), str(id)]).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> tuple[datetime, PydanticObjectId]:
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        created_at, id = json.loads(raw)
+        return datetime.fromisoformat(created_at), PydanticObjectId(id)
+    except Exception:
+        raise HTTPException(400, "Invalid cursor")
+
+
+class Page(BaseModel, Generic[T]):
+    items: list[T]
+    next_cursor: Optional[str] = None
+
+
+class PageParams:
+    def __init__(
+        self,
+        cursor: Optional[str] = None,
+        limit: int = Query(
+            settings.PAGE_DEFAULT_LIMIT, ge=1, le=settings.PAGE_MAX_LIMIT
+        ),
+    ):
+        self.cursor = cursor
+        self.limit = limit
+
+
+def after_cursor(filters: dict, cursor: Optional[str]) -> dict:
+    """Adds the keyset condition for the page following `cursor` to `filters`"""
+    if not cursor:
+        return filters
+
+    created_at, id = decode_cursor(cursor)
+    return {
+        **filters,
+        "$or": [
+            {"created_at": {"$lt": created_at}},
+            {"created_at": created_at, "_id": {"$lt": id}},
+        ],
+    }
+
+
+def make_page(items: list, limit: int) -> dict:
+    """
+    Trims a `limit + 1` long result to `limit` items,
+    the extra item only tells whether there is a next page.
+    """
+    next_cursor = None
+    if len(items) > limit:
+        items = items[:limit]
+        next_cursor = encode_cursor(items[-1].created_at, items[-1].id)
+
+    return {"items": items, "next_cursor": next_cursor}
+
+
+async def paginate(
+    document: Type[Document],
+    filters: dict,
+    page: PageParams,
+    projection_model=None,
+) -> dict:
+    """Returns one page of `document` newest first as {items, next_cursor}"""
+    items = (
+        await document.find(after_cursor(filters, page.cursor))
+        .sort(PAGE_SORT)
+        .limit(page.limit + 1)
+        .project(projection_model)
+        .to_list()
+    )
+
+    return make_page(items, page.limit)
@@ -1,5 +1,9 @@
+import asyncio
 import secrets
 import string
+import time
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+
 import bcrypt
 
 from app.core.config import settings
@@ -11,6 +15,82 @@ def hash_password(password: str) -> str:
     return bcrypt.hashpw(password.encode(), settings.SALT_SECRET_KEY.encode()).decode()
 
 
+def verify_password(password: str, hashed_password: str) -> bool:
+    """Checks a password against a stored hash"""
+
+    return bcrypt.checkpw(password.encode(), hashed_password.encode())
+
+
+class PasswordHasher:
+    """
+    Runs bcrypt in a bounded worker pool so hashing never blocks the event loop.
+    At most `max_workers` hashes run at once, everything above that waits in the
+    pool queue and is reported as `queue_depth`.
+    """
+
+    def __init__(self, max_workers: int, executor: str = "thread"):
+        if executor not in ("thread", "process"):
+            raise ValueError(f"Unknown password hash executor: {executor}")
+
+        self.max_workers = max_workers
+        self.executor_kind = executor
+        self._executor: Executor | None = None
+        self.pending = 0
+        self.completed = 0
+        self.total_seconds = 0.0
+
+    @property
+    def executor(self) -> Executor:
+        if self._executor is None:
+            if self.executor_kind == "process":
+                self._executor = ProcessPoolExecutor(max_workers=self.max_workers)
+            else:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self.max_workers, thread_name_prefix="bcrypt"
+                )
+        return self._executor
+
+    async def _run(self, func, *args):
+        loop = asyncio.get_running_loop()
+        started = time.perf_counter()
+        self.pending += 1
+        try:
+            return await loop.run_in_executor(self.executor, func, *args)
+        finally:
+            self.pending -= 1
+            self.completed += 1
+            self.total_seconds += time.perf_counter() - started
+
+    async def hash(self, password: str) -> str:
+        return await self._run(hash_password, password)
+
+    async def verify(self, password: str, hashed_password: str) -> bool:
+        return await self._run(verify_password, password, hashed_password)
+
+    def shutdown(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+
+    def stats(self) -> dict:
+        return {
+            "executor": self.executor_kind,
+            "max_workers": self.max_workers,
+            "in_flight": min(self.pending, self.max_workers),
+            "queue_depth": max(self.pending - self.max_workers, 0),
+            "completed": self.completed,
+            "avg_seconds": (
+                self.total_seconds / self.completed if self.completed else 0.0
+            ),
+        }
+
+
+password_hasher = PasswordHasher(
+    max_workers=settings.PASSWORD_HASH_WORKERS,
+    executor=settings.PASSWORD_HASH_EXECUTOR,
+)
+
+
 def generate_password(length: int = 10) -> str:
     """Returns a random string of length"""
     alphabet = string.ascii_letters + string.digits
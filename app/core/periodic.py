@@ -0,0 +1,64 @@
+import asyncio
+import logging
+import time
+from typing import Awaitable, Callable
+
+logger = logging.getLogger(__name__)
+
+
+class PeriodicTask:
+    """
+    Runs `func` every `interval` seconds in the background of one worker.
+    An interval of 0 disables the task.
+    """
+
+    def __init__(self, name: str, interval: float, func: Callable[[], Awaitable]):
+        self.name = name
+        self.interval = interval
+        self.func = func
+        self._task: asyncio.Task | None = None
+        self.runs = 0
+        self.failures = 0
+        self.last_duration = 0.0
+        self.last_result = None
+
+    def start(self):
+        if self.interval > 0 and self._task is None:
+            self._task = asyncio.create_task(self._loop(), name=self.name)
+
+    async def stop(self):
+        if self._task is None:
+            return
+
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+
+    async def run_once(self):
+        started = time.perf_counter()
+        try:
+            self.last_result = await self.func()
+        except Exception:
+            self.failures += 1
+            logger.exception("Periodic task %s failed", self.name)
+        finally:
+            self.runs += 1
+            self.last_duration = time.perf_counter() - started
+
+    async def _loop(self):
+        while True:
+            await asyncio.sleep(self.interval)
+            await self.run_once()
+
+    def stats(self) -> dict:
+        return {
+            "enabled": self._task is not None,
+            "interval": self.interval,
+            "runs": self.runs,
+            "failures": self.failures,
+            "last_duration": self.last_duration,
+            "last_result": self.last_result,
+        }
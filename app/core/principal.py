@@ -0,0 +1,31 @@
+from dataclasses import dataclass, field
+from typing import Optional
+
+from beanie import PydanticObjectId
+
+from app.core.membership_cache import get_membership
+from v1.models.authorized_device import AuthorizedDevice
+from v1.models.user import StaffMembership, UserDoc
+
+
+@dataclass
+class Principal:
+    """Authenticated caller of a private endpoint, resolved once per request"""
+
+    claims: dict
+    user: UserDoc
+    device: AuthorizedDevice
+    _membership: Optional[StaffMembership] = field(default=None, repr=False)
+    _membership_loaded: bool = field(default=False, repr=False)
+
+    @property
+    def id(self) -> PydanticObjectId:
+        return self.user.id
+
+    async def get_membership(self) -> Optional[StaffMembership]:
+        """Returns the staff membership of the caller, loaded at most once"""
+        if not self._membership_loaded:
+            self._membership = await get_membership(self.user.id)
+            self._membership_loaded = True
+
+        return self._membership
@@ -0,0 +1,175 @@
+import time
+from abc import ABC, abstractmethod
+from typing import Optional
+
+from fastapi import HTTPException
+
+from app.core.cache import TTLCache
+from app.core.config import settings
+from app.core.email_fixer import EmailFixer
+
+
+class RateLimitBackend(ABC):
+    """
+    Storage for limiter state. The in-memory backend is per process; a shared
+    backend (e.g. Redis) only has to implement these two calls to make the
+    limits hold across every worker.
+    """
+
+    @abstractmethod
+    async def get(self, key: str) -> Optional[dict]:
+        ...
+
+    @abstractmethod
+    async def set(self, key: str, state: dict, ttl: float):
+        ...
+
+
+class InMemoryRateLimitBackend(RateLimitBackend):
+    def __init__(self, maxsize: int):
+        self._cache = TTLCache(maxsize=maxsize, ttl=60)
+
+    async def get(self, key: str) -> Optional[dict]:
+        return self._cache.get(key)
+
+    async def set(self, key: str, state: dict, ttl: float):
+        self._cache.set(key, state, ttl=ttl)
+
+
+class TokenBucket:
+    """Token bucket with exponential backoff after consecutive failures"""
+
+    def __init__(
+        self,
+        backend: RateLimitBackend,
+        capacity: int,
+        per_minute: float,
+        backoff_base: float,
+        backoff_max: float,
+    ):
+        self.backend = backend
+        self.capacity = capacity
+        self.refill_rate = per_minute / 60
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+
+    @property
+    def ttl(self) -> float:
+        # long enough for an idle bucket to refill and for the longest backoff
+        return max(self.capacity / self.refill_rate, self.backoff_max)
+
+    async def _load(self, key: str, now: float) -> dict:
+        state = await self.backend.get(key)
+        if not state:
+            return {"tokens": self.capacity, "updated_at": now, "failures": 0}
+
+        elapsed = now - state["updated_at"]
+        return {
+            **state,
+            "tokens": min(self.capacity, state["tokens"] + elapsed * self.refill_rate),
+            "updated_at": now,
+        }
+
+    async def retry_after(self, key: str) -> float:
+        """Seconds until `key` may try again, 0 if it may try now"""
+        now = time.time()
+        state = await self._load(key, now)
+
+        blocked_for = state.get("blocked_until", 0) - now
+        if state["tokens"] < 1:
+            blocked_for = max(blocked_for, (1 - state["tokens"]) / self.refill_rate)
+
+        return max(blocked_for, 0)
+
+    async def consume(self, key: str):
+        now = time.time()
+        state = await self._load(key, now)
+        state["tokens"] -= 1
+        await self.backend.set(key, state, self.ttl)
+
+    async def fail(self, key: str):
+        now = time.time()
+        state = await self._load(key, now)
+        state["failures"] += 1
+        state["blocked_until"] = now + min(
+            self.backoff_base * 2 ** (state["failures"] - 1), self.backoff_max
+        )
+        await self.backend.set(key, state, self.ttl)
+
+    async def reset_failures(self, key: str):
+        now = time.time()
+        state = await self._load(key, now)
+        state["failures"] = 0
+        state.pop("blocked_until", None)
+        await self.backend.set(key, state, self.ttl)
+
+
+class SigninThrottle:
+    """
+    Limits signin attempts per normalized email and per client IP.
+    Over-limit attempts are rejected with 429 before any password hashing.
+    """
+
+    def __init__(self, backend: RateLimitBackend):
+        self.email_bucket = TokenBucket(
+            backend,
+            capacity=settings.SIGNIN_EMAIL_BURST,
+            per_minute=settings.SIGNIN_EMAIL_PER_MINUTE,
+            backoff_base=settings.SIGNIN_BACKOFF_BASE_SECONDS,
+            backoff_max=settings.SIGNIN_BACKOFF_MAX_SECONDS,
+        )
+        self.ip_bucket = TokenBucket(
+            backend,
+            capacity=settings.SIGNIN_IP_BURST,
+            per_minute=settings.SIGNIN_IP_PER_MINUTE,
+            backoff_base=settings.SIGNIN_BACKOFF_BASE_SECONDS,
+            backoff_max=settings.SIGNIN_BACKOFF_MAX_SECONDS,
+        )
+        self.allowed = 0
+        self.rejected = 0
+
+    def _keys(self, email: str, ip: str) -> tuple[str, str]:
+        return (
+            f"signin:email:{EmailFixer().fix(email.strip().lower())}",
+            f"signin:ip:{ip}",
+        )
+
+    async def check(self, email: str, ip: str):
+        email_key, ip_key = self._keys(email, ip)
+
+        retry_after = max(
+            await self.email_bucket.retry_after(email_key),
+            await self.ip_bucket.retry_after(ip_key),
+        )
+        if retry_after:
+            self.rejected += 1
+            raise HTTPException(
+                status_code=429,
+                detail="Too many signin attempts, try again later",
+                headers={"Retry-After": str(int(retry_after) + 1)},
+            )
+
+        await self.email_bucket.consume(email_key)
+        await self.ip_bucket.consume(ip_key)
+        self.allowed += 1
+
+    async def record_failure(self, email: str, ip: str):
+        # backoff is per account only, an IP may be shared by many users
+        # and is already bounded by its own bucket
+        email_key, _ = self._keys(email, ip)
+        await self.email_bucket.fail(email_key)
+
+    async def record_success(self, email: str, ip: str):
+        email_key, _ = self._keys(email, ip)
+        await self.email_bucket.reset_failures(email_key)
+
+    def stats(self) -> dict:
+        return {
+            "allowed": self.allowed,
+            "rejected": self.rejected,
+        }
+
+
+signin_throttle = SigninThrottle(
+    InMemoryRateLimitBackend(maxsize=settings.SIGNIN_THROTTLE_CACHE_SIZE)
+)
@@ -0,0 +1,18 @@
+from fastapi import Response
+from pydantic import BaseModel
+
+
+def model_response(
+    model: BaseModel, status_code: int = 200, by_alias: bool = True
+) -> Response:
+    """
+    Serializes a model to JSON bytes in one pydantic-core pass, skipping
+    FastAPI's jsonable_encoder. Declare the same model as the route's
+    response_model to keep it in the OpenAPI schema. Pass by_alias=False
+    for routes that have always returned "id" rather than "_id".
+    """
+    return Response(
+        content=model.model_dump_json(by_alias=by_alias),
+        status_code=status_code,
+        media_type="application/json",
+    )
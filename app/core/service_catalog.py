@@ -0,0 +1,108 @@
+import asyncio
+import time
+from typing import Optional
+
+from beanie import PydanticObjectId
+
+from app.core.config import settings
+from v1.models.document import ServiceDocument
+
+# a lookup miss may be a document created by another worker,
+# but misses must not turn into a query per request
+MISS_RECHECK_INTERVAL = 1
+
+
+class ServiceCatalog:
+    """
+    Process-wide copy of the service_documents collection.
+    The collection only changes through the staff create endpoint, so it is
+    loaded at startup, updated in place on create, and otherwise revalidated
+    against a (count, last updated_at) version at most every `check_interval`.
+    """
+
+    def __init__(self, check_interval: float):
+        self.check_interval = check_interval
+        self.version: Optional[tuple] = None
+        self._documents: dict[PydanticObjectId, ServiceDocument] = {}
+        self._required_fields: dict[PydanticObjectId, frozenset[str]] = {}
+        self._checked_at = 0.0
+        self._lock = asyncio.Lock()
+        self.loads = 0
+        self.version_checks = 0
+
+    def _index(self, documents: list[ServiceDocument]):
+        self._documents = {document.id: document for document in documents}
+        self._required_fields = {
+            document.id: frozenset(document.required_fields) for document in documents
+        }
+        self.version = (
+            len(documents),
+            max((document.updated_at for document in documents), default=None),
+        )
+
+    async def _current_version(self) -> tuple:
+        result = await ServiceDocument.aggregate(
+            [
+                {
+                    "$group": {
+                        "_id": None,
+                        "count": {"$sum": 1},
+                        "updated_at": {"$max": "$updated_at"},
+                    }
+                }
+            ]
+        ).to_list()
+        self.version_checks += 1
+        if not result:
+            return (0, None)
+        return (result[0]["count"], result[0]["updated_at"])
+
+    async def load(self):
+        documents = await ServiceDocument.find().sort("created_at").to_list()
+        self._index(documents)
+        self._checked_at = time.monotonic()
+        self.loads += 1
+
+    async def refresh(self, max_age: Optional[float] = None):
+        """Reloads the catalog if its version changed and was not checked lately"""
+        max_age = self.check_interval if max_age is None else max_age
+        if time.monotonic() - self._checked_at < max_age:
+            return
+
+        async with self._lock:
+            if time.monotonic() - self._checked_at < max_age:
+                return
+
+            if await self._current_version() != self.version:
+                await self.load()
+            else:
+                self._checked_at = time.monotonic()
+
+    def add(self, document: ServiceDocument):
+        self._index([*self._documents.values(), document])
+
+    async def get(self, id: PydanticObjectId) -> Optional[ServiceDocument]:
+        await self.refresh()
+        if id not in self._documents:
+            await self.refresh(max_age=MISS_RECHECK_INTERVAL)
+        return self._documents.get(id)
+
+    async def all(self) -> list[ServiceDocument]:
+        await self.refresh()
+        return list(self._documents.values())
+
+    async def required_fields(self, id: PydanticObjectId) -> frozenset[str]:
+        await self.refresh()
+        if id not in self._required_fields:
+            await self.refresh(max_age=MISS_RECHECK_INTERVAL)
+        return self._required_fields.get(id, frozenset())
+
+    def stats(self) -> dict:
+        return {
+            "size": len(self._documents),
+            "loads": self.loads,
+            "version_checks": self.version_checks,
+        }
+
+
+service_catalog = ServiceCatalog(check_interval=settings.SERVICE_CATALOG_CHECK_INTERVAL)
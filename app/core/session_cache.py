@@ -0,0 +1,26 @@
+from app.core.cache import TTLCache
+from app.core.config import settings
+from v1.models.authorized_device import AuthorizedDevice
+
+
+class SessionCache(TTLCache):
+    """
+    Authorized devices keyed by (user_id, authorized_device_id).
+    Sessions only appear on signin and disappear on device removal, so both
+    paths update the cache directly; the TTL bounds how long another worker
+    process may keep trusting a device that was removed elsewhere.
+    """
+
+    def get_device(self, user_id, device_id) -> AuthorizedDevice | None:
+        return self.get((str(user_id), str(device_id)))
+
+    def add_device(self, device: AuthorizedDevice):
+        self.set((str(device.user_id), str(device.id)), device)
+
+    def revoke_device(self, user_id, device_id):
+        self.invalidate((str(user_id), str(device_id)))
+
+
+session_cache = SessionCache(
+    maxsize=settings.SESSION_CACHE_SIZE, ttl=settings.SESSION_CACHE_TTL
+)
@@ -0,0 +1,50 @@
+from datetime import datetime
+
+from app.core.config import settings
+from app.core.periodic import PeriodicTask
+from v1.models.document import ConfrimationToken
+
+
+class TokenSweeper(PeriodicTask):
+    """
+    Deletes expired confirmation tokens in batches. The TTL index on
+    expire_at already removes them, this only bounds the delay of its
+    once-a-minute monitor when that matters.
+    """
+
+    def __init__(self, interval: float, batch_size: int):
+        super().__init__("confirmation-token-sweeper", interval, self.sweep)
+        self.batch_size = batch_size
+        self.deleted = 0
+
+    async def sweep(self) -> int:
+        collection = ConfrimationToken.get_motor_collection()
+        now = datetime.utcnow()
+        deleted = 0
+
+        while True:
+            ids = [
+                token["_id"]
+                async for token in collection.find(
+                    {"expire_at": {"$lt": now}}, {"_id": 1}
+                ).limit(self.batch_size)
+            ]
+            if not ids:
+                break
+
+            result = await collection.delete_many({"_id": {"$in": ids}})
+            deleted += result.deleted_count
+            if len(ids) < self.batch_size:
+                break
+
+        self.deleted += deleted
+        return deleted
+
+    def stats(self) -> dict:
+        return {**super().stats(), "deleted": self.deleted}
+
+
+token_sweeper = TokenSweeper(
+    interval=settings.CONFIRMATION_TOKEN_SWEEP_INTERVAL,
+    batch_size=settings.CONFIRMATION_TOKEN_SWEEP_BATCH,
+)
@@ -1,10 +1,10 @@
 from fastapi import HTTPException
 
-from v1.models.user import StaffMembership
+from app.core.principal import Principal
 
 
-async def validate_membership(user_id, required_membership: int):
-    user_membership = await StaffMembership.find_one({"user_id": user_id})
+async def validate_membership(principal: Principal, required_membership: int):
+    user_membership = await principal.get_membership()
     if not user_membership:
         raise HTTPException(403, "You are not a staff member")
 
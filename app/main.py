@@ -1,37 +1,32 @@
+from contextlib import asynccontextmanager
+
 from beanie import init_beanie
 from fastapi import Depends, FastAPI, APIRouter
+from fastapi.responses import ORJSONResponse
 from fastapi.middleware.cors import CORSMiddleware
 
 
+from app.core.auto_assign import auto_assigner
 from app.core.config import settings
-from app.core.database import db
+from app.core import database
+from app.core.notification_janitor import notification_janitor
+from app.core.notification_outbox import notification_outbox
+from app.core.password import password_hasher
+from app.core.service_catalog import service_catalog
+from app.core.token_sweeper import token_sweeper
 from v1.models.application import ApplicationDoc
 from v1.models.authorized_device import AuthorizedDevice
-from v1.models.notification import Notification
+from v1.models.notification import Notification, NotificationCounter
 from v1.models.user import UserDoc, StaffMembership
 from v1.models.document import ApexDocument, ConfrimationToken, ServiceDocument
 from v1.router import router as v1_router
 
 
-def get_application():
-    _app = FastAPI(title=settings.PROJECT_NAME)
-
-    _app.add_middleware(
-        CORSMiddleware,
-        allow_origins=[str(origin) for origin in settings.BACKEND_CORS_ORIGINS],
-        allow_credentials=True,
-        allow_methods=["*"],
-        allow_headers=["*"],
-    )
-
-    return _app
-
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    db = await database.connect()
 
-app = get_application()
-
-
-@app.on_event("startup")
-async def on_startup():
+    # init_beanie also creates the indexes declared on each model's Settings
     await init_beanie(
         database=db,
         document_models=[
@@ -40,11 +35,48 @@ async def on_startup():
             AuthorizedDevice,
             StaffMembership,
             Notification,
+            NotificationCounter,
             ApexDocument,
             ServiceDocument,
             ConfrimationToken,
         ],
     )
+    await service_catalog.load()
+    token_sweeper.start()
+    notification_janitor.start()
+    auto_assigner.start()
+    notification_outbox.start()
+
+    yield
+
+    await token_sweeper.stop()
+    await auto_assigner.stop()
+    await notification_janitor.stop()
+    # last, so it drains what the tasks above queued
+    await notification_outbox.stop()
+    password_hasher.shutdown()
+    database.close()
+
+
+def get_application():
+    _app = FastAPI(
+        title=settings.PROJECT_NAME,
+        default_response_class=ORJSONResponse,
+        lifespan=lifespan,
+    )
+
+    _app.add_middleware(
+        CORSMiddleware,
+        allow_origins=[str(origin) for origin in settings.BACKEND_CORS_ORIGINS],
+        allow_credentials=True,
+        allow_methods=["*"],
+        allow_headers=["*"],
+    )
+
+    return _app
+
+
+app = get_application()
 
 
 @app.get("/")
@@ -0,0 +1,80 @@
+"""
+Serialization cost of one page of 10k applications, the way the staff
+listings used to respond (jsonable_encoder and a JSONResponse) against
+model_response (one model_dump_json pass).
+
+Run from the repository root with the app's environment (.env) and the
+dev dependencies installed:
+
+    python -m bench.serialize_10k [items] [rounds]
+"""
+import asyncio
+import json
+import sys
+import timeit
+from datetime import datetime
+
+from beanie import PydanticObjectId, init_beanie
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse, ORJSONResponse
+from mongomock_motor import AsyncMongoMockClient
+
+from app.core.pagination import Page
+from app.core.responses import model_response
+from v1.models.application import ApplicationDoc
+
+
+def make_page(size: int) -> Page[ApplicationDoc]:
+    now = datetime.now()
+    items = [
+        ApplicationDoc(
+            id=PydanticObjectId(),
+            operator_id=PydanticObjectId(),
+            user_id=PydanticObjectId(),
+            service_document_id=PydanticObjectId(),
+            data={
+                "first_name": "Ann",
+                "last_name": "B",
+                "born": {"date": "1990-01-01", "place": "Kyiv"},
+            },
+            created_at=now,
+            modified_at=now,
+        )
+        for _ in range(size)
+    ]
+    return Page[ApplicationDoc](items=items, next_cursor=None)
+
+
+def main(size: int = 10_000, rounds: int = 5):
+    # documents can only be built once beanie knows their collection
+    asyncio.run(
+        init_beanie(
+            database=AsyncMongoMockClient()["apexid_bench"],
+            document_models=[ApplicationDoc],
+        )
+    )
+    page = make_page(size)
+
+    encoders = {
+        "jsonable_encoder + JSONResponse": lambda: JSONResponse(
+            jsonable_encoder(page.model_dump())
+        ).body,
+        "jsonable_encoder + ORJSONResponse": lambda: ORJSONResponse(
+            jsonable_encoder(page.model_dump())
+        ).body,
+        "model_response (model_dump_json)": lambda: model_response(
+            page, by_alias=False
+        ).body,
+    }
+
+    bodies = {name: encode() for name, encode in encoders.items()}
+    same = len({json.dumps(json.loads(body)) for body in bodies.values()}) == 1
+    print(f"{size} items, {rounds} rounds, identical JSON: {same}")
+
+    for name, encode in encoders.items():
+        seconds = timeit.timeit(encode, number=rounds) / rounds
+        print(f"  {name:<36} {seconds * 1000:8.1f} ms  {len(bodies[name]):>10} bytes")
+
+
+if __name__ == "__main__":
+    main(*[int(arg) for arg in sys.argv[1:3]])
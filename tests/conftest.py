@@ -0,0 +1,50 @@
+import os
+
+import bcrypt
+import pytest
+
+# Settings has required fields without defaults
+os.environ.setdefault("PROJECT_NAME", "apexid-test")
+os.environ.setdefault("API_BASE_URL", "http://localhost:8000")
+os.environ.setdefault("DATABASE_NAME", "apexid_test")
+os.environ.setdefault("DATABASE_URL", "mongodb://localhost:27017")
+os.environ.setdefault("SECRET_KEY", "test-secret")
+os.environ.setdefault("SALT_SECRET_KEY", bcrypt.gensalt(4).decode())
+
+from beanie import init_beanie  # noqa: E402
+
+from tests.helpers import DOCUMENT_MODELS, run  # noqa: E402
+
+
+@pytest.fixture
+def mock_db():
+    """Beanie on an in-process mongomock database, fresh per test"""
+    from mongomock_motor import AsyncMongoMockClient
+
+    db = AsyncMongoMockClient()["apexid_test"]
+    run(init_beanie(database=db, document_models=DOCUMENT_MODELS))
+    return db
+
+
+@pytest.fixture(scope="session")
+def mongo_url():
+    """
+    A real mongod, needed where mongomock falls short (e.g. explain).
+    TEST_MONGO_URL points at a running server, otherwise pymongo_inmemory
+    starts one; the tests are skipped if neither is available.
+    """
+    if os.environ.get("TEST_MONGO_URL"):
+        yield os.environ["TEST_MONGO_URL"]
+        return
+
+    try:
+        from pymongo_inmemory.context import Context
+        from pymongo_inmemory.mongod import Mongod
+
+        mongod = Mongod(Context())
+        mongod.start()
+    except Exception as e:
+        pytest.skip(f"No MongoDB server available: {e}")
+
+    yield mongod.connection_string
+    mongod.stop()
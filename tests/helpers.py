@@ -0,0 +1,24 @@
+import asyncio
+
+from v1.models.application import ApplicationDoc
+from v1.models.authorized_device import AuthorizedDevice
+from v1.models.document import ApexDocument, ConfrimationToken, ServiceDocument
+from v1.models.notification import Notification, NotificationCounter
+from v1.models.user import StaffMembership, UserDoc
+
+# the models app.main registers with init_beanie
+DOCUMENT_MODELS = [
+    UserDoc,
+    ApplicationDoc,
+    AuthorizedDevice,
+    StaffMembership,
+    Notification,
+    NotificationCounter,
+    ApexDocument,
+    ServiceDocument,
+    ConfrimationToken,
+]
+
+
+def run(coroutine):
+    return asyncio.run(coroutine)
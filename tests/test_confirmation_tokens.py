@@ -0,0 +1,71 @@
+from datetime import datetime
+
+from beanie import PydanticObjectId
+from pymongo.errors import DuplicateKeyError
+
+from app.core.principal import Principal
+from tests.helpers import run
+from v1.models.document import ApexDocument, ConfrimationToken
+from v1.models.user import UserDoc
+from v1.private.profile import confirm_document
+
+
+class RacingCollection:
+    """Lets a concurrent confirm insert the user's token document first"""
+
+    def __init__(self, collection):
+        self.collection = collection
+        self.raced = False
+
+    async def update_one(self, filter, update, upsert=False):
+        if upsert and not self.raced:
+            self.raced = True
+            await self.collection.insert_one(
+                {**filter, "document_id": PydanticObjectId(), "token": None}
+            )
+            raise DuplicateKeyError("E11000 duplicate key error")
+        return await self.collection.update_one(filter, update, upsert=upsert)
+
+
+def test_user_id_is_unique_per_token_document(mock_db):
+    names = [
+        index["name"]
+        for index in run(
+            ConfrimationToken.get_motor_collection().list_indexes().to_list(None)
+        )
+        if index.get("unique")
+    ]
+    assert "user_id_1" in names
+
+
+def test_confirm_updates_the_document_a_concurrent_confirm_inserted(
+    mock_db, monkeypatch
+):
+    user_id = PydanticObjectId()
+    collection = RacingCollection(ConfrimationToken.get_motor_collection())
+    monkeypatch.setattr(
+        ConfrimationToken, "get_motor_collection", classmethod(lambda cls: collection)
+    )
+
+    async def scenario():
+        document = await ApexDocument(
+            service_id=PydanticObjectId(),
+            user_id=user_id,
+            data={},
+            created_at=datetime.now(),
+            updated_at=datetime.now(),
+        ).insert()
+        principal = Principal(
+            claims={}, user=UserDoc.model_construct(id=user_id), device=None
+        )
+
+        response = await confirm_document(str(document.id), principal)
+        tokens = await collection.collection.find({"user_id": user_id}).to_list(None)
+        return document, response, tokens
+
+    document, response, tokens = run(scenario())
+
+    assert collection.raced
+    assert len(tokens) == 1
+    assert str(tokens[0]["token"]) == response["token"]
+    assert tokens[0]["document_id"] == document.id
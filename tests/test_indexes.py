@@ -0,0 +1,97 @@
+import datetime
+
+import pytest
+from beanie import PydanticObjectId, init_beanie
+from motor.motor_asyncio import AsyncIOMotorClient
+
+from app.core.pagination import PAGE_SORT, after_cursor, encode_cursor
+from tests.helpers import DOCUMENT_MODELS, run
+from v1.models.application import ApplicationDoc, ApplicationStatus
+from v1.models.authorized_device import AuthorizedDevice
+from v1.models.document import ApexDocument, ConfrimationToken
+from v1.models.notification import Notification
+from v1.models.user import StaffMembership, UserDoc
+
+USER_ID = PydanticObjectId()
+CURSOR = encode_cursor(datetime.datetime.now(), PydanticObjectId())
+
+
+def page(model, filters, cursor=None):
+    return (
+        model.get_motor_collection()
+        .find(after_cursor(filters, cursor))
+        .sort(PAGE_SORT)
+        .limit(51)
+    )
+
+
+# the hot queries, shaped as the handlers send them
+HOT_QUERIES = {
+    "users.email": lambda: UserDoc.get_motor_collection().find(
+        {"email": "user@example.com"}
+    ),
+    "authorized_devices.user_id page": lambda: page(
+        AuthorizedDevice, {"user_id": USER_ID}
+    ),
+    "notifications.user_id page": lambda: page(Notification, {"user_id": USER_ID}),
+    "notifications.user_id next page": lambda: page(
+        Notification, {"user_id": USER_ID}, CURSOR
+    ),
+    "applications apply duplicate check": lambda: ApplicationDoc.get_motor_collection().find(
+        {
+            "user_id": USER_ID,
+            "service_document_id": PydanticObjectId(),
+            "status": {
+                "$in": [
+                    ApplicationStatus.PENDING.value,
+                    ApplicationStatus.AWAITING_OPERATOR.value,
+                ]
+            },
+        }
+    ),
+    "applications assignments page": lambda: page(
+        ApplicationDoc,
+        {"operator_id": USER_ID, "status": ApplicationStatus.PENDING.value},
+    ),
+    "apex_documents.user_id page": lambda: page(ApexDocument, {"user_id": USER_ID}),
+    "staff_membership.user_id": lambda: StaffMembership.get_motor_collection().find(
+        {"user_id": USER_ID}
+    ),
+    "confirmation_tokens.token": lambda: ConfrimationToken.get_motor_collection().find(
+        {"token": PydanticObjectId()}
+    ),
+    "confirmation_tokens.user_id": lambda: ConfrimationToken.get_motor_collection().find(
+        {"user_id": USER_ID}
+    ),
+}
+
+
+def plan_stages(plan) -> list[str]:
+    """Every stage name in a (possibly nested) explain plan"""
+    if isinstance(plan, list):
+        return [stage for item in plan for stage in plan_stages(item)]
+    if not isinstance(plan, dict):
+        return []
+
+    stages = [plan["stage"]] if "stage" in plan else []
+    for value in plan.values():
+        stages += plan_stages(value)
+    return stages
+
+
+@pytest.mark.parametrize("name", HOT_QUERIES)
+def test_hot_query_uses_an_index(mongo_url, name):
+    async def explain():
+        client = AsyncIOMotorClient(mongo_url, uuidRepresentation="standard")
+        try:
+            await init_beanie(
+                database=client["apexid_index_test"], document_models=DOCUMENT_MODELS
+            )
+            return await HOT_QUERIES[name]().explain()
+        finally:
+            client.close()
+
+    stages = plan_stages(run(explain())["queryPlanner"]["winningPlan"])
+
+    assert stages
+    assert "COLLSCAN" not in stages, f"{name} scans the collection: {stages}"
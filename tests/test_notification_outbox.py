@@ -0,0 +1,66 @@
+from datetime import datetime
+
+import pytest
+from beanie import PydanticObjectId
+
+from app.core.notification_counters import get_unread, remove_unread
+from app.core.notification_outbox import NotificationOutbox
+from tests.helpers import run
+from v1.models.notification import Notification
+
+
+def make_outbox() -> NotificationOutbox:
+    return NotificationOutbox(batch_size=10, flush_interval=1, max_size=100)
+
+
+def notification_for(user_id: PydanticObjectId) -> Notification:
+    return Notification(user_id=user_id, message="hello", created_at=datetime.now())
+
+
+async def mark_all_read(user_id: PydanticObjectId):
+    """What POST /my/notifications/read does"""
+    result = await Notification.get_motor_collection().update_many(
+        {"user_id": user_id, "read_at": None}, {"$set": {"read_at": datetime.now()}}
+    )
+    await remove_unread(user_id, result.modified_count)
+
+
+def test_mark_read_right_after_the_insert_leaves_no_unread(mock_db, monkeypatch):
+    user_id = PydanticObjectId()
+    insert_many = Notification.insert_many
+
+    async def insert_then_read(documents, **kwargs):
+        result = await insert_many(documents, **kwargs)
+        await mark_all_read(user_id)
+        return result
+
+    monkeypatch.setattr(Notification, "insert_many", insert_then_read)
+
+    async def scenario():
+        await make_outbox().put(notification_for(user_id), notification_for(user_id))
+        return await get_unread(user_id)
+
+    assert run(scenario()) == 0
+
+
+def test_failed_insert_takes_its_count_back(mock_db, monkeypatch):
+    user_id = PydanticObjectId()
+    insert_many = Notification.insert_many
+
+    async def unavailable(documents, **kwargs):
+        raise ConnectionError("no primary")
+
+    async def scenario():
+        outbox = make_outbox()
+        batch = [notification_for(user_id), notification_for(user_id)]
+
+        monkeypatch.setattr(Notification, "insert_many", unavailable)
+        with pytest.raises(ConnectionError):
+            await outbox._write(batch)
+        unread_after_failure = await get_unread(user_id)
+
+        monkeypatch.setattr(Notification, "insert_many", insert_many)
+        await outbox._write(batch)
+        return unread_after_failure, await get_unread(user_id)
+
+    assert run(scenario()) == (0, 2)
@@ -0,0 +1,47 @@
+import json
+from datetime import datetime, timedelta
+
+from beanie import PydanticObjectId
+
+from tests.helpers import run
+from v1.models.notification import Notification
+from v1.private.profile import notification_events
+
+
+class DisconnectedRequest:
+    async def is_disconnected(self) -> bool:
+        return True
+
+
+def notification_at(user_id: PydanticObjectId, created: datetime) -> Notification:
+    return Notification(
+        id=PydanticObjectId.from_datetime(created),
+        user_id=user_id,
+        message="hello",
+        created_at=created,
+    )
+
+
+def test_resume_replays_ids_queued_before_the_last_event(mock_db):
+    user_id = PydanticObjectId()
+    last_sent = datetime.now()
+
+    async def scenario():
+        last = await notification_at(user_id, last_sent).insert()
+        # queued in another worker just before `last`, inserted after it
+        late = await notification_at(user_id, last_sent - timedelta(seconds=1)).insert()
+        await notification_at(user_id, last_sent - timedelta(hours=1)).insert()
+
+        events = [
+            event
+            async for event in notification_events(
+                DisconnectedRequest(), user_id, str(last.id)
+            )
+        ]
+        return last, late, events
+
+    last, late, events = run(scenario())
+
+    payloads = [json.loads(event.split("data: ")[1]) for event in events]
+    assert [payload["_id"] for payload in payloads] == [str(late.id), str(last.id)]
+    assert all(payload["user_id"] == str(user_id) for payload in payloads)
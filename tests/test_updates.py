@@ -0,0 +1,135 @@
+from datetime import datetime
+
+from beanie import PydanticObjectId
+from beanie.odm.queries.find import FindOne
+
+from app.core.application_transitions import transition_query
+from app.core.principal import Principal
+from app.core.service_catalog import service_catalog
+from tests.helpers import run
+from v1.models.application import ApplicationDoc, ApplicationStatus
+from v1.models.document import ServiceDocument
+from v1.models.user import StaffLevel, StaffMembership, UserDoc
+from v1.private.staff import promote_user
+from v1.private.staff.applications import set_application_data
+from v1.schemas.user import BirthData
+
+
+def make_user(email: str) -> UserDoc:
+    return UserDoc(
+        email=email,
+        password="x",
+        first_name="Ann",
+        last_name="B",
+        gender="female",
+        born=BirthData(date="1990-01-01", place="Kyiv"),
+        phone_number="+380000000000",
+        nationality="UA",
+    )
+
+
+async def make_principal(level: StaffLevel) -> Principal:
+    user = await make_user(f"{level.name.lower()}@example.com").insert()
+    membership = await StaffMembership(
+        user_id=user.id,
+        level=level,
+        promoted_by=user.id,
+        created_at=datetime.now(),
+        updated_at=datetime.now(),
+    ).insert()
+    return Principal(
+        claims={},
+        user=user,
+        device=None,
+        _membership=membership,
+        _membership_loaded=True,
+    )
+
+
+def test_promote_saves_only_the_changed_membership_fields(mock_db, monkeypatch):
+    saved = []
+    save_changes = StaffMembership.save_changes
+
+    async def record_changes(self, *args, **kwargs):
+        saved.append(self.get_changes())
+        return await save_changes(self, *args, **kwargs)
+
+    monkeypatch.setattr(StaffMembership, "save_changes", record_changes)
+
+    async def scenario():
+        admin = await make_principal(StaffLevel.ADMIN)
+        target = await make_user("target@example.com").insert()
+        await StaffMembership(
+            user_id=target.id,
+            level=StaffLevel.JUNIOR_OPERATOR,
+            promoted_by=PydanticObjectId(),
+            created_at=datetime(2020, 1, 1),
+            updated_at=datetime(2020, 1, 1),
+        ).insert()
+
+        await promote_user(str(target.id), StaffLevel.OPERATOR.value, admin)
+
+    run(scenario())
+
+    assert len(saved) == 1
+    assert set(saved[0]) == {"level", "promoted_by", "updated_at"}
+
+
+def test_transitions_set_only_the_status_and_their_changes():
+    application_id = PydanticObjectId()
+    edges = {
+        "assign": {"operator_id": PydanticObjectId()},
+        "deassign": {"operator_id": None},
+        "approve": {"message": "Looks good"},
+    }
+
+    for edge, changes in edges.items():
+        query, update = transition_query(application_id, edge, changes=changes)
+
+        assert list(update) == ["$set"], edge
+        assert set(update["$set"]) == {"status", "modified_at", *changes}, edge
+        assert "data" not in update["$set"], edge
+        assert query["_id"] == application_id
+
+
+def test_set_application_data_sets_only_the_one_field(mock_db, monkeypatch):
+    updates = []
+    update = FindOne.update
+
+    def record_update(self, *args, **kwargs):
+        updates.append(args)
+        return update(self, *args, **kwargs)
+
+    monkeypatch.setattr(FindOne, "update", record_update)
+
+    async def scenario():
+        operator = await make_principal(StaffLevel.OPERATOR)
+        service_document = await ServiceDocument(
+            name="Passport",
+            description="",
+            required_fields=["first_name", "last_name"],
+            created_at=datetime.now(),
+            updated_at=datetime.now(),
+        ).insert()
+        service_catalog.add(service_document)
+        application = await ApplicationDoc(
+            operator_id=operator.id,
+            user_id=PydanticObjectId(),
+            service_document_id=service_document.id,
+            data={"first_name": "Ann"},
+            status=ApplicationStatus.AWAITING_DATA,
+            created_at=datetime.now(),
+            modified_at=datetime.now(),
+        ).insert()
+
+        await set_application_data(str(application.id), "last_name", "B", operator)
+        return await ApplicationDoc.get(application.id)
+
+    application = run(scenario())
+
+    assert len(updates) == 1
+    (expression,) = updates[0]
+    assert list(expression) == ["$set"]
+    assert set(expression["$set"]) == {"data.last_name", "modified_at"}
+    assert application.data == {"first_name": "Ann", "last_name": "B"}
+    assert application.status == ApplicationStatus.AWAITING_DATA
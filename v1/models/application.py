@@ -3,6 +3,7 @@ from enum import Enum
 from typing import Optional
 from beanie import Document, PydanticObjectId
 from pydantic import Field
+from pymongo import ASCENDING, DESCENDING, IndexModel
 
 
 class ApplicationStatus(Enum):
@@ -20,10 +21,41 @@ class ApplicationDoc(Document):
     service_document_id: PydanticObjectId
     data: dict = {}
     status: ApplicationStatus = Field(default=ApplicationStatus.AWAITING_OPERATOR)
+    # verdict message of the operator
+    message: Optional[str] = None
     created_at: datetime
     modified_at: datetime
 
     class Settings:
         name = "applications"
+        # save_changes() writes a $set of the changed fields only
+        use_state_management = True
 
         unique_together = [("_id", "user_id")]
+        indexes = [
+            IndexModel(
+                [
+                    ("user_id", ASCENDING),
+                    ("service_document_id", ASCENDING),
+                    ("status", ASCENDING),
+                ]
+            ),
+            IndexModel(
+                [
+                    ("operator_id", ASCENDING),
+                    ("status", ASCENDING),
+                    ("created_at", DESCENDING),
+                    ("_id", DESCENDING),
+                ]
+            ),
+            IndexModel(
+                [
+                    ("user_id", ASCENDING),
+                    ("created_at", DESCENDING),
+                    ("_id", DESCENDING),
+                ]
+            ),
+            IndexModel([("created_at", DESCENDING), ("_id", DESCENDING)]),
+            # oldest waiting applications first
+            IndexModel([("status", ASCENDING), ("created_at", ASCENDING)]),
+        ]
@@ -3,6 +3,7 @@ from enum import Enum
 from typing import Optional
 from beanie import Document, PydanticObjectId
 from pydantic import Field
+from pymongo import ASCENDING, DESCENDING, IndexModel
 
 
 class AuthorizedDevice(Document):
@@ -13,3 +14,12 @@ class AuthorizedDevice(Document):
     class Settings:
         name = "authorized_devices"
         unique_together = [("user_id", "_id")]
+        indexes = [
+            IndexModel(
+                [
+                    ("user_id", ASCENDING),
+                    ("created_at", DESCENDING),
+                    ("_id", DESCENDING),
+                ]
+            ),
+        ]
@@ -2,6 +2,11 @@ from datetime import datetime, timedelta
 from typing import Optional
 from beanie import Document, PydanticObjectId
 from pydantic import Field
+from pymongo import ASCENDING, DESCENDING, IndexModel
+
+from v1.schemas.document import PublicCard
+
+CONFIRMATION_TOKEN_LIFETIME = timedelta(minutes=3)
 
 
 class ApexDocument(Document):
@@ -11,9 +16,19 @@ class ApexDocument(Document):
     created_at: datetime
     updated_at: datetime
     metadata: Optional[dict] = {}
+    public_card: Optional[PublicCard] = None
 
     class Settings:
         name = "apex_documents"
+        indexes = [
+            IndexModel(
+                [
+                    ("user_id", ASCENDING),
+                    ("created_at", DESCENDING),
+                    ("_id", DESCENDING),
+                ]
+            ),
+        ]
 
 
 class ServiceDocument(Document):
@@ -29,11 +44,21 @@ class ServiceDocument(Document):
 
 
 class ConfrimationToken(Document):
+    """One per user, `token` is rotated every time the user confirms a document"""
+
     user_id: PydanticObjectId
     document_id: PydanticObjectId
+    token: PydanticObjectId = Field(default_factory=PydanticObjectId)
+    # UTC, the TTL index reads it as such
     expire_at: datetime = Field(
-        default_factory=lambda: datetime.now() + timedelta(minutes=3)
+        default_factory=lambda: datetime.utcnow() + CONFIRMATION_TOKEN_LIFETIME
     )
 
     class Settings:
         name = "confirmation_tokens"
+        indexes = [
+            # one token document per user, concurrent upserts can not both insert
+            IndexModel([("user_id", ASCENDING)], unique=True),
+            IndexModel([("token", ASCENDING)], unique=True, sparse=True),
+            IndexModel([("expire_at", ASCENDING)], expireAfterSeconds=0),
+        ]
@@ -2,15 +2,42 @@ from datetime import datetime
 from typing import Optional
 from beanie import Document, PydanticObjectId
 from pydantic import Field
+from pymongo import ASCENDING, DESCENDING, IndexModel
 
 
 class Notification(Document):
     user_id: PydanticObjectId
-    message: str
+    # older notifications were stored rendered, newer ones as a template
+    message: Optional[str] = None
+    template: Optional[str] = None
+    params: dict = {}
     created_at: datetime
     created_by: Optional[str] = "system"
     metadata: Optional[dict] = {}
+    read_at: Optional[datetime] = None
 
     class Settings:
         name = "notifications"
         unique_together = [("user_id", "_id")]
+        indexes = [
+            IndexModel(
+                [
+                    ("user_id", ASCENDING),
+                    ("created_at", DESCENDING),
+                    ("_id", DESCENDING),
+                ]
+            ),
+            IndexModel([("user_id", ASCENDING), ("_id", ASCENDING)]),
+            # retention and rollup
+            IndexModel([("created_at", ASCENDING)]),
+        ]
+
+
+class NotificationCounter(Document):
+    """Unread notifications of a user, `id` is the user id"""
+
+    id: PydanticObjectId
+    unread: int = 0
+
+    class Settings:
+        name = "notification_counters"
@@ -2,6 +2,7 @@ from datetime import datetime
 from beanie import Document, PydanticObjectId
 from pydantic import BaseModel, Field
 from enum import Enum
+from pymongo import ASCENDING, IndexModel
 
 from v1.schemas.user import BirthData
 
@@ -19,6 +20,11 @@ class UserDoc(Document):
 
     class Settings:
         name = "users"
+        # save_changes() writes a $set of the changed fields only
+        use_state_management = True
+        indexes = [
+            IndexModel([("email", ASCENDING)]),
+        ]
 
 
 class StaffLevel(Enum):
@@ -35,3 +41,9 @@ class StaffMembership(Document):
     promoted_by: PydanticObjectId
     created_at: datetime
     updated_at: datetime
+
+    class Settings:
+        use_state_management = True
+        indexes = [
+            IndexModel([("user_id", ASCENDING)]),
+        ]
@@ -1,5 +1,5 @@
 from fastapi import APIRouter, Depends
-from app.core.fastjwt import FastJWT
+from app.core.fastjwt import login_required
 
 from v1.private.profile import profile_router
 
@@ -8,9 +8,7 @@ from v1.private.application import application_router
 from v1.private.staff import staff_router
 
 
-private_router = APIRouter(
-    prefix="/private", dependencies=[Depends(FastJWT().login_required)]
-)
+private_router = APIRouter(prefix="/private", dependencies=[Depends(login_required)])
 
 
 private_router.include_router(profile_router)
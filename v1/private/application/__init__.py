@@ -2,15 +2,19 @@ from datetime import datetime
 import re
 from typing import Optional
 from beanie import PydanticObjectId
-from fastapi import APIRouter, Depends, HTTPException, Request
+from fastapi import APIRouter, Depends, HTTPException
 from pydantic import BaseModel, validator
-from app.core.fastjwt import FastJWT
+from app.core.application_transitions import transition
+from app.core.fastjwt import login_required
+from app.core.pagination import PageParams, paginate
+from app.core.principal import Principal
+from app.core.service_catalog import service_catalog
 
 
 from v1.models.application import ApplicationDoc, ApplicationStatus
-from v1.models.user import BirthData, UserDoc
+from app.core.notification_outbox import notification_outbox
 from v1.models.notification import Notification
-from v1.models.document import ServiceDocument
+from v1.schemas.application import CabinetItem
 
 
 application_router = APIRouter(prefix="/application")
@@ -19,20 +23,20 @@ application_router = APIRouter(prefix="/application")
 # list of available services
 @application_router.get("/serviceDocuments")
 async def service_documents():
-    _service_documents = await ServiceDocument.find().to_list()
-
-    return _service_documents
+    return await service_catalog.all()
 
 
 @application_router.get("/{service_document_id}/apply")
-async def apply(service_document_id: str, request: Request):
+async def apply(
+    service_document_id: str, principal: Principal = Depends(login_required)
+):
     if not PydanticObjectId.is_valid(service_document_id):
         raise HTTPException(
             status_code=400,
             detail="Invalid service_document_id",
         )
 
-    service_document = await ServiceDocument.get(PydanticObjectId(service_document_id))
+    service_document = await service_catalog.get(PydanticObjectId(service_document_id))
 
     if not service_document:
         raise HTTPException(
@@ -40,9 +44,7 @@ async def apply(service_document_id: str, request: Request):
             detail="Service document not found",
         )
 
-    auth_token = await FastJWT().decode(request.headers["Authorization"])
-    auth_token["id"] = PydanticObjectId(auth_token["id"])
-    _user = await UserDoc.get(auth_token["id"])
+    _user = principal.user
 
     _ap = await ApplicationDoc.find_one(
         {
@@ -76,11 +78,14 @@ async def apply(service_document_id: str, request: Request):
         modified_at=now,
     ).insert()
 
-    await Notification(
-        user_id=_user.id,
-        message=f"Application 'REF_{str(application.id)}' created",
-        created_at=now,
-    ).insert()
+    await notification_outbox.put(
+        Notification(
+            user_id=_user.id,
+            template="application_created",
+            params={"application_id": str(application.id)},
+            created_at=now,
+        )
+    )
 
     return {
         "reference": f"REF_{str(application.id)}",
@@ -88,44 +93,43 @@ async def apply(service_document_id: str, request: Request):
 
 
 @application_router.get("/cabinet")
-async def cabinet(request: Request):
-    auth_token = await FastJWT().decode(request.headers["Authorization"])
-    auth_token["id"] = PydanticObjectId(auth_token["id"])
-    _user = await UserDoc.get(auth_token["id"])
-
-    _ap = await ApplicationDoc.find({"user_id": _user.id}).to_list()
+async def cabinet(
+    page: PageParams = Depends(), principal: Principal = Depends(login_required)
+):
+    _page = await paginate(
+        ApplicationDoc, {"user_id": principal.id}, page, projection_model=CabinetItem
+    )
 
     applications = []
 
-    for ap in _ap:
-        service_document = await ServiceDocument.get(ap.service_document_id)
+    for ap in _page["items"]:
+        service_document = await service_catalog.get(ap.service_document_id)
 
         applications.append(
             {
                 "reference": f"REF_{str(ap.id)}",
-                "document_name": service_document.name,
+                "document_name": service_document.name if service_document else None,
                 "status": ap.status,
             }
         )
 
-    return applications
+    return {"items": applications, "next_cursor": _page["next_cursor"]}
 
 
 @application_router.get("/cabinet/{reference}/status")
-async def cabinet_status(reference: str, request: Request):
+async def cabinet_status(
+    reference: str, principal: Principal = Depends(login_required)
+):
     if not re.match(r"REF_[a-f0-9]{24}", reference):
         raise HTTPException(
             status_code=400,
             detail="Invalid reference",
         )
-    jwt_token = await FastJWT().decode(request.headers["Authorization"])
-    jwt_token["id"] = PydanticObjectId(jwt_token["id"])
-
-    _user = await UserDoc.get(jwt_token["id"])
 
-    _ap = await ApplicationDoc.find_one({"user_id": _user.id})
-
-    _service_document_name = (await ServiceDocument.get(_ap.service_document_id)).name
+    _ap = await ApplicationDoc.find_one(
+        {"user_id": principal.id, "_id": PydanticObjectId(reference[4:])},
+        projection_model=CabinetItem,
+    )
 
     if not _ap:
         raise HTTPException(
@@ -133,24 +137,25 @@ async def cabinet_status(reference: str, request: Request):
             detail="Application not found",
         )
 
+    service_document = await service_catalog.get(_ap.service_document_id)
+
     return {
         "status": _ap.status,
-        "document_name": _service_document_name,
+        "document_name": service_document.name if service_document else None,
     }
 
 
 # get missing data
 @application_router.get("/cabinet/{reference}/missing_data")
-async def get_missing_data(reference: str, request: Request):
+async def get_missing_data(
+    reference: str, principal: Principal = Depends(login_required)
+):
     if not re.match(r"REF_[a-f0-9]{24}", reference):
         raise HTTPException(
             status_code=400,
             detail="Invalid reference",
         )
-    jwt_token = await FastJWT().decode(request.headers["Authorization"])
-    jwt_token["id"] = PydanticObjectId(jwt_token["id"])
-
-    _user = await UserDoc.get(jwt_token["id"])
+    _user = principal.user
 
     _ap = await ApplicationDoc.find_one(
         {"user_id": _user.id, "_id": PydanticObjectId(reference[4:])}
@@ -169,7 +174,7 @@ async def get_missing_data(reference: str, request: Request):
         )
 
     # get service document
-    _service_document = await ServiceDocument.get(_ap.service_document_id)
+    _service_document = await service_catalog.get(_ap.service_document_id)
 
     missing_data = []
     for field in _service_document.required_fields:
@@ -191,16 +196,15 @@ class MissingData(BaseModel):
 
 
 @application_router.post("/cabinet/{reference}/missing_data")
-async def send_missing_data(reference: str, payload: MissingData, request: Request):
+async def send_missing_data(
+    reference: str, payload: MissingData, principal: Principal = Depends(login_required)
+):
     if not re.match(r"REF_[a-f0-9]{24}", reference):
         raise HTTPException(
             status_code=400,
             detail="Invalid reference",
         )
-    jwt_token = await FastJWT().decode(request.headers["Authorization"])
-    jwt_token["id"] = PydanticObjectId(jwt_token["id"])
-
-    _user = await UserDoc.get(jwt_token["id"])
+    _user = principal.user
 
     _ap = await ApplicationDoc.find_one(
         {"user_id": _user.id, "_id": PydanticObjectId(reference[4:])}
@@ -218,24 +222,21 @@ async def send_missing_data(reference: str, payload: MissingData, request: Reque
             detail="Application is not awaiting data",
         )
 
-    _service_document = await ServiceDocument.get(_ap.service_document_id)
-
-    missing_data = []
-    for field in _service_document.required_fields:
-        if field not in _ap.data:
-            missing_data.append(field)
+    required_fields = await service_catalog.required_fields(_ap.service_document_id)
 
-    provided_data = list(payload.data.keys())
-    if set(provided_data) != set(missing_data):
+    if set(payload.data.keys()) != required_fields - set(_ap.data.keys()):
         raise HTTPException(
             status_code=400,
             detail="Provided data does not match missing data",
         )
 
-    _ap.data = {**_ap.data, **payload.data}
-    _ap.status = ApplicationStatus.PENDING
-    _ap.modified_at = datetime.now()
-    await _ap.save()
+    await transition(
+        _ap.id,
+        "submit_data",
+        filters={"user_id": _user.id},
+        changes={f"data.{key}": value for key, value in payload.data.items()},
+        modified_at=_ap.modified_at,
+    )
 
     return {
         "reference": f"REF_{str(_ap.id)}",
@@ -244,37 +245,18 @@ async def send_missing_data(reference: str, payload: MissingData, request: Reque
 
 # cancel application
 @application_router.delete("/{reference}")
-async def cancel_application(reference: str, request: Request):
+async def cancel_application(
+    reference: str, principal: Principal = Depends(login_required)
+):
     if not re.match(r"REF_[a-f0-9]{24}", reference):
         raise HTTPException(
             status_code=400,
             detail="Invalid reference",
         )
-    jwt_token = await FastJWT().decode(request.headers["Authorization"])
-    jwt_token["id"] = PydanticObjectId(jwt_token["id"])
-
-    _user = await UserDoc.get(jwt_token["id"])
-
-    _ap = await ApplicationDoc.find_one(
-        {"user_id": _user.id, "_id": PydanticObjectId(reference[4:])}
+    _ap = await transition(
+        PydanticObjectId(reference[4:]), "cancel", filters={"user_id": principal.id}
     )
 
-    if not _ap:
-        raise HTTPException(
-            status_code=404,
-            detail="Application not found",
-        )
-
-    if _ap.status in [ApplicationStatus.APPROVED, ApplicationStatus.REJECTED]:
-        raise HTTPException(
-            status_code=400,
-            detail="Application is already processed",
-        )
-
-    _ap.status = ApplicationStatus.CANCELLED
-    _ap.modified_at = datetime.now()
-    await _ap.save()
-
     return {
         "reference": f"REF_{str(_ap.id)}",
     }
@@ -1,64 +1,64 @@
+import asyncio
+from typing import Optional
 from beanie import PydanticObjectId
-from fastapi import APIRouter, Depends, HTTPException, Request
+from fastapi import APIRouter, Depends, Header, HTTPException, Request
+from fastapi.responses import StreamingResponse
+from pymongo.errors import DuplicateKeyError
 import datetime
 from app.core.config import settings
-from app.core.fastjwt import FastJWT
-from v1.models.document import ApexDocument, ConfrimationToken, ServiceDocument
+from app.core.document_token import build_public_card, document_token_signer
+from app.core.fastjwt import login_required
+from app.core.notification_bus import notification_bus, replay_since, sse_event
+from app.core.notification_counters import get_unread, remove_unread
+from app.core.pagination import Page, PageParams, paginate
+from app.core.principal import Principal
+from app.core.responses import model_response
+from app.core.session_cache import session_cache
+from v1.models.document import (
+    CONFIRMATION_TOKEN_LIFETIME,
+    ApexDocument,
+    ConfrimationToken,
+    ServiceDocument,
+)
 from v1.models.application import ApplicationDoc, ApplicationStatus
-from v1.models.user import UserDoc
 from v1.models.authorized_device import AuthorizedDevice
 from v1.models.notification import Notification
+from v1.schemas.application import ApplicationState
+from v1.schemas.notification import MarkRead, NotificationView
+from v1.schemas.user import ProfileView
 
 
 profile_router = APIRouter(prefix="/profile")
 
 
 async def is_user_active(id: str):
-    _ap = await ApplicationDoc.find_one({"user_id": id})
+    _ap = await ApplicationDoc.find_one(
+        {"user_id": id}, projection_model=ApplicationState
+    )
     if _ap and _ap.status == ApplicationStatus.APPROVED:
         return
     raise HTTPException(403, "User is not active")
 
 
 @profile_router.get("/my")
-async def profile(request: Request):
-    auth_token = await FastJWT().decode(request.headers["Authorization"])
-    auth_token["id"] = PydanticObjectId(auth_token["id"])
-
-    await is_user_active(auth_token["id"])
-
-    _user = await UserDoc.get(auth_token["id"])
-    _user = _user.model_dump()
-
-    to_show = [
-        "id",
-        "first_name",
-    ]
-    for key in list(_user.keys()):
-        if key not in to_show:
-            _user.pop(key)
-
-    return _user
+async def profile(principal: Principal = Depends(login_required)):
+    await is_user_active(principal.id)
 
+    # already loaded by login_required, no second read
+    return ProfileView(id=principal.id, first_name=principal.user.first_name)
 
-@profile_router.get("/my/devices")
-async def devices(request: Request):
-    auth_token = await FastJWT().decode(request.headers["Authorization"])
-    auth_token["id"] = PydanticObjectId(auth_token["id"])
 
-    _devices = await AuthorizedDevice.find(
-        {"user_id": auth_token["id"]},
-    ).to_list()
-
-    return _devices
+@profile_router.get("/my/devices", response_model=Page[AuthorizedDevice])
+async def devices(
+    page: PageParams = Depends(), principal: Principal = Depends(login_required)
+):
+    _page = await paginate(AuthorizedDevice, {"user_id": principal.id}, page)
+    return model_response(Page[AuthorizedDevice](**_page))
 
 
 # delete device
 @profile_router.delete("/my/devices/{device_id}")
-async def delete_device(device_id: str, request: Request):
-    auth_token = await FastJWT().decode(request.headers["Authorization"])
-    auth_token["id"] = PydanticObjectId(auth_token["id"])
-
+async def delete_device(device_id: str, principal: Principal = Depends(login_required)):
     _device = await AuthorizedDevice.get(device_id)
     if not _device:
         raise HTTPException(
@@ -66,52 +66,115 @@ async def delete_device(device_id: str, request: Request):
             detail="Device not found",
         )
 
-    if _device.user_id != auth_token["id"]:
+    if _device.user_id != principal.id:
         raise HTTPException(
             status_code=403,
             detail="You are not allowed to delete this device",
         )
 
     await _device.delete()
+    session_cache.revoke_device(_device.user_id, _device.id)
     return {"status": "ok"}
 
 
 # get all notifications sorted
-@profile_router.get("/my/notifications")
-async def notifications(request: Request):
-    auth_token = await FastJWT().decode(request.headers["Authorization"])
-    auth_token["id"] = PydanticObjectId(auth_token["id"])
-
-    _notifications = (
-        await Notification.find(
-            {"user_id": auth_token["id"]},
-        )
-        .sort("-created_at")
-        .to_list()
+@profile_router.get("/my/notifications", response_model=Page[NotificationView])
+async def notifications(
+    page: PageParams = Depends(), principal: Principal = Depends(login_required)
+):
+    _page = await paginate(
+        Notification, {"user_id": principal.id}, page, projection_model=NotificationView
+    )
+    return model_response(Page[NotificationView](**_page))
+
+
+async def notification_events(
+    request: Request, user_id: PydanticObjectId, last_event_id: Optional[str]
+):
+    # subscribe before replaying, so nothing published meanwhile is lost
+    queue = notification_bus.subscribe(user_id)
+    try:
+        # delivery is at least once, clients drop ids they already have
+        replayed = set()
+        if last_event_id and PydanticObjectId.is_valid(last_event_id):
+            since = replay_since(PydanticObjectId(last_event_id))
+            _missed = (
+                await Notification.find({"user_id": user_id, "_id": {"$gte": since}})
+                .sort("_id")
+                .limit(settings.NOTIFICATION_STREAM_REPLAY_LIMIT)
+                .to_list()
+            )
+            for notification in _missed:
+                yield sse_event(notification)
+                replayed.add(notification.id)
+
+        while not await request.is_disconnected():
+            try:
+                notification = await asyncio.wait_for(
+                    queue.get(), settings.NOTIFICATION_STREAM_HEARTBEAT
+                )
+            except asyncio.TimeoutError:
+                yield ": keep-alive\n\n"
+                continue
+
+            # already sent by the replay
+            if notification.id in replayed:
+                continue
+
+            yield sse_event(notification)
+    finally:
+        notification_bus.unsubscribe(user_id, queue)
+
+
+# live notifications as Server-Sent Events, resumable with Last-Event-ID
+@profile_router.get("/my/notifications/stream")
+async def notifications_stream(
+    request: Request,
+    last_event_id: Optional[str] = Header(None),
+    principal: Principal = Depends(login_required),
+):
+    return StreamingResponse(
+        notification_events(request, principal.id, last_event_id),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
     )
 
-    return _notifications
 
+# unread count, a single counter read instead of counting notifications
+@profile_router.get("/my/notifications/summary")
+async def notifications_summary(principal: Principal = Depends(login_required)):
+    return {"unread": await get_unread(principal.id)}
 
-# get my documents
-@profile_router.get("/my/documents")
-async def documents(request: Request):
-    auth_token = await FastJWT().decode(request.headers["Authorization"])
-    auth_token["id"] = PydanticObjectId(auth_token["id"])
 
-    _documents = await ApexDocument.find(
-        {"user_id": auth_token["id"]},
-    ).to_list()
+# mark the given or all unread notifications as read
+@profile_router.post("/my/notifications/read")
+async def read_notifications(
+    data: MarkRead, principal: Principal = Depends(login_required)
+):
+    filters = {"user_id": principal.id, "read_at": None}
+    if data.ids is not None:
+        filters["_id"] = {"$in": data.ids}
 
-    return _documents
+    result = await Notification.get_motor_collection().update_many(
+        filters, {"$set": {"read_at": datetime.datetime.now()}}
+    )
+    await remove_unread(principal.id, result.modified_count)
+
+    return {"status": "ok", "read": result.modified_count}
+
+
+# get my documents
+@profile_router.get("/my/documents", response_model=Page[ApexDocument])
+async def documents(
+    page: PageParams = Depends(), principal: Principal = Depends(login_required)
+):
+    _page = await paginate(ApexDocument, {"user_id": principal.id}, page)
+    return model_response(Page[ApexDocument](**_page))
 
 
 # get my document
 @profile_router.get("/my/documents/{document_id}")
-async def document(document_id: str, request: Request):
-    auth_token = await FastJWT().decode(request.headers["Authorization"])
-    auth_token["id"] = PydanticObjectId(auth_token["id"])
-
+async def document(document_id: str, principal: Principal = Depends(login_required)):
     _document = await ApexDocument.get(document_id)
     if not _document:
         raise HTTPException(
@@ -119,7 +182,7 @@ async def document(document_id: str, request: Request):
             detail="Document not found",
         )
 
-    if _document.user_id != auth_token["id"]:
+    if _document.user_id != principal.id:
         raise HTTPException(
             status_code=403,
             detail="You are not allowed to view this document",
@@ -130,10 +193,9 @@ async def document(document_id: str, request: Request):
 
 # Generate the confirmation token for the document that will expire in 3 minutes
 @profile_router.get("/my/documents/{document_id}/confirm")
-async def confirm_document(document_id: str, request: Request):
-    auth_token = await FastJWT().decode(request.headers["Authorization"])
-    auth_token["id"] = PydanticObjectId(auth_token["id"])
-
+async def confirm_document(
+    document_id: str, principal: Principal = Depends(login_required)
+):
     _document = await ApexDocument.get(document_id)
     if not _document:
         raise HTTPException(
@@ -141,19 +203,43 @@ async def confirm_document(document_id: str, request: Request):
             detail="Document not found",
         )
 
-    if _document.user_id != auth_token["id"]:
+    if _document.user_id != principal.id:
         raise HTTPException(
             status_code=403,
             detail="You are not allowed to confirm this document",
         )
 
-    # delete all old tokens of the user
-    await ConfrimationToken.find({"user_id": auth_token["id"]}).delete()
-
+    if settings.CONFIRMATION_TOKEN_MODE == "signed":
+        _public_card = await build_public_card(_document)
+        if not _public_card:
+            raise HTTPException(
+                status_code=400,
+                detail="Document can not be confirmed",
+            )
+
+        return {
+            "token": document_token_signer.issue(
+                _public_card, CONFIRMATION_TOKEN_LIFETIME
+            )
+        }
+
+    # replace the previous token of the user, if any
     _token = ConfrimationToken(
-        user_id=auth_token["id"],
+        user_id=principal.id,
         document_id=_document.id,
     )
-    await _token.insert()
-
-    return {"token": str(_token.id)}
+    _update = {
+        "$set": {
+            "document_id": _token.document_id,
+            "token": _token.token,
+            "expire_at": _token.expire_at,
+        }
+    }
+    _tokens = ConfrimationToken.get_motor_collection()
+    try:
+        await _tokens.update_one({"user_id": principal.id}, _update, upsert=True)
+    except DuplicateKeyError:
+        # a concurrent confirm inserted the user's document first, update it
+        await _tokens.update_one({"user_id": principal.id}, _update)
+
+    return {"token": str(_token.token)}
@@ -1,7 +1,21 @@
-from fastapi import APIRouter, Depends, HTTPException, Request
+from fastapi import APIRouter, Depends, HTTPException
 from v1.private.staff.applications import staff_application_router
 from beanie import PydanticObjectId
-from app.core.fastjwt import FastJWT
+from app.core.auto_assign import auto_assigner
+from app.core.dashboard import queue_dashboard
+from app.core.database import pool_stats
+from app.core.fastjwt import login_required
+from app.core.membership_cache import invalidate_membership, membership_cache
+from app.core.notification_bus import notification_bus
+from app.core.notification_janitor import notification_janitor
+from app.core.notification_outbox import notification_outbox
+from app.core.password import password_hasher
+from app.core.principal import Principal
+from app.core.rate_limit import signin_throttle
+from app.core.service_catalog import service_catalog
+from app.core.session_cache import session_cache
+from app.core.token_sweeper import token_sweeper
+from app.core.validate_membership import validate_membership
 from v1.models.application import ApplicationDoc, ApplicationStatus
 from v1.models.user import UserDoc, StaffLevel, StaffMembership
 from v1.private.staff.document import document_router
@@ -15,7 +29,9 @@ staff_router.include_router(document_router)
 
 
 @staff_router.post("/promote")
-async def promote_user(user_id: str, level: int, request: Request):
+async def promote_user(
+    user_id: str, level: int, principal: Principal = Depends(login_required)
+):
     if not user_id or not PydanticObjectId.is_valid(user_id):
         raise HTTPException(400, "Invalid user_id")
     user_id = PydanticObjectId(user_id)
@@ -23,10 +39,7 @@ async def promote_user(user_id: str, level: int, request: Request):
     if level not in StaffLevel._value2member_map_:
         raise HTTPException(400, "Invalid level")
 
-    auth_token = await FastJWT().decode(request.headers["Authorization"])
-    auth_token["id"] = PydanticObjectId(auth_token["id"])
-    user = await UserDoc.get(auth_token["id"])
-    _initiator_membership = await StaffMembership.find_one({"user_id": user.id})
+    _initiator_membership = await principal.get_membership()
     if not _initiator_membership:
         raise HTTPException(403, "You are not a staff member")
 
@@ -40,6 +53,7 @@ async def promote_user(user_id: str, level: int, request: Request):
     if not target_user:
         raise HTTPException(404, "User not found")
 
+    # read the target fresh, this is the write path
     user_membership = await StaffMembership.find_one({"user_id": user_id})
 
     if user_membership and user_membership.level.value == level:
@@ -52,17 +66,38 @@ async def promote_user(user_id: str, level: int, request: Request):
         raise HTTPException(403, "You do not have enough permissions")
 
     if not user_membership:
-        user_membership = StaffMembership(
+        await StaffMembership(
             user_id=PydanticObjectId(user_id),
-            membership=StaffLevel(level),
-            promoted_by=auth_token["id"],
+            level=StaffLevel(level),
+            promoted_by=principal.id,
             created_at=datetime.now(),
             updated_at=datetime.now(),
-        )
+        ).insert()
     else:
         user_membership.level = StaffLevel(level)
-        user_membership.promoted_by = auth_token["id"]
+        user_membership.promoted_by = principal.id
         user_membership.updated_at = datetime.now()
-
-    await user_membership.save()
+        await user_membership.save_changes()
+    invalidate_membership(user_id)
     return {"message": "User promoted"}
+
+
+# in-process runtime stats of this worker
+@staff_router.get("/stats")
+async def get_stats(principal: Principal = Depends(login_required)):
+    await validate_membership(principal, StaffLevel.ADMIN.value)
+
+    return {
+        "session_cache": session_cache.stats(),
+        "password_hasher": password_hasher.stats(),
+        "signin_throttle": signin_throttle.stats(),
+        "service_catalog": service_catalog.stats(),
+        "membership_cache": membership_cache.stats(),
+        "token_sweeper": token_sweeper.stats(),
+        "notification_janitor": notification_janitor.stats(),
+        "auto_assign": auto_assigner.stats(),
+        "queue_dashboard": queue_dashboard.stats(),
+        "notification_outbox": notification_outbox.stats(),
+        "notification_bus": notification_bus.stats(),
+        "mongo_pool": pool_stats.stats(),
+    }
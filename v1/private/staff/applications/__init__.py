@@ -1,77 +1,251 @@
 from datetime import datetime
+from typing import Literal, Optional
 from beanie import PydanticObjectId
-from fastapi import APIRouter, Depends, HTTPException, Request
-from app.core.fastjwt import FastJWT
+from fastapi import APIRouter, Depends, HTTPException
+from fastapi.responses import StreamingResponse
+from pydantic import ValidationError
+from app.core.application_transitions import bulk_transition, transition
+from app.core.config import settings
+from app.core.dashboard import queue_dashboard
+from app.core.export import EXPORT_MEDIA_TYPES, stream_rows
+from app.core.fastjwt import login_required
+from app.core.membership_cache import get_membership
+from app.core.pagination import Page, PageParams, paginate
+from app.core.principal import Principal
+from app.core.responses import model_response
+from app.core.service_catalog import service_catalog
 from app.core.validate_membership import validate_membership
 from v1.models.application import ApplicationDoc, ApplicationStatus
-from v1.models.user import UserDoc, StaffLevel, StaffMembership
-from v1.models.document import ServiceDocument, ApexDocument
-from v1.schemas.application import ApplicationVerdictMessage
+from v1.models.user import UserDoc, StaffLevel
+from v1.models.document import ApexDocument
+from v1.schemas.application import (
+    ApplicationListItem,
+    ApplicationState,
+    ApplicationVerdictMessage,
+    BulkApplications,
+    BulkReject,
+)
+from v1.schemas.document import PublicCard
+from v1.schemas.user import UserView
+from app.core.notification_outbox import notification_outbox
 from v1.models.notification import Notification
 
 
 staff_application_router = APIRouter(prefix="/application")
 
 
-@staff_application_router.get("/all")
-async def get_all_applications(request: Request):
-    auth_token = await FastJWT().decode(request.headers["Authorization"])
-    auth_token["id"] = PydanticObjectId(auth_token["id"])
-    await validate_membership(auth_token["id"], StaffLevel.ADMIN.value)
+@staff_application_router.get(
+    "/all",
+    response_model=Page[ApplicationListItem],
+    response_model_by_alias=False,
+)
+async def get_all_applications(
+    page: PageParams = Depends(), principal: Principal = Depends(login_required)
+):
+    await validate_membership(principal, StaffLevel.ADMIN.value)
 
-    _applications = await ApplicationDoc.all().to_list()
-    applications = []
+    _page = await paginate(
+        ApplicationDoc, {}, page, projection_model=ApplicationListItem
+    )
+    return model_response(Page[ApplicationListItem](**_page), by_alias=False)
+
+
+EXPORT_FIELDS = [
+    "_id",
+    "user_id",
+    "operator_id",
+    "service_document_id",
+    "status",
+    "created_at",
+    "modified_at",
+]
+
+
+# stream applications as NDJSON or CSV without loading them into memory
+@staff_application_router.get("/export")
+async def export_applications(
+    format: Literal["ndjson", "csv"] = "ndjson",
+    status: Optional[ApplicationStatus] = None,
+    service_document_id: Optional[str] = None,
+    created_from: Optional[datetime] = None,
+    created_to: Optional[datetime] = None,
+    principal: Principal = Depends(login_required),
+):
+    await validate_membership(principal, StaffLevel.ADMIN.value)
+
+    filters = {}
+    if status:
+        filters["status"] = status.value
+    if service_document_id:
+        if not PydanticObjectId.is_valid(service_document_id):
+            raise HTTPException(400, "Invalid service_document_id")
+        filters["service_document_id"] = PydanticObjectId(service_document_id)
+    if created_from or created_to:
+        filters["created_at"] = {}
+        if created_from:
+            filters["created_at"]["$gte"] = created_from
+        if created_to:
+            filters["created_at"]["$lt"] = created_to
+
+    cursor = (
+        ApplicationDoc.get_motor_collection()
+        .find(filters, {field: 1 for field in EXPORT_FIELDS})
+        .sort("created_at", 1)
+        .batch_size(settings.EXPORT_BATCH_SIZE)
+    )
 
-    for application in _applications:
-        applications.append(application.model_dump())
+    return StreamingResponse(
+        stream_rows(cursor, EXPORT_FIELDS, format),
+        media_type=EXPORT_MEDIA_TYPES[format],
+        headers={"Content-Disposition": f"attachment; filename=applications.{format}"},
+    )
 
-    return applications
 
+async def validate_operator(operator: str, initiator_membership: StaffLevel):
+    # check if operator have enough permissions
+    operator_membership = await get_membership(operator)
+    if not operator_membership:
+        raise HTTPException(403, "Operator is not a staff member")
 
-@staff_application_router.patch("/{application_id}/assign/{operator}")
-async def assign_application(application_id: str, operator: str, request: Request):
-    # check if application id and operator id are valid
-    if not PydanticObjectId.is_valid(application_id):
-        raise HTTPException(400, "Invalid application_id")
+    # check if operator level is lower than the initiator
+    if operator_membership.level.value > initiator_membership.value:
+        raise HTTPException(403, "You do not have enough permissions")
+
+
+async def run_bulk(
+    edge: str,
+    data: BulkApplications,
+    notification_params,
+    changes: Optional[dict] = None,
+) -> dict:
+    results, moved = await bulk_transition(
+        edge,
+        ids=data.ids,
+        filters=data.filter.query() if data.filter else None,
+        changes=changes,
+        limit=settings.APPLICATION_BULK_MAX_ITEMS,
+    )
+
+    now = datetime.now()
+    await notification_outbox.put(
+        *[
+            Notification(
+                user_id=application.user_id,
+                created_at=now,
+                **notification_params(application),
+            )
+            for application in moved
+        ]
+    )
+
+    return {
+        "results": results,
+        "succeeded": len(moved),
+        "failed": len(results) - len(moved),
+    }
+
+
+# bulk endpoints take ids or a filter and report a status code per application
+@staff_application_router.patch("/bulk/assign/{operator}")
+async def bulk_assign_applications(
+    operator: str,
+    data: BulkApplications,
+    principal: Principal = Depends(login_required),
+):
     if not PydanticObjectId.is_valid(operator):
         raise HTTPException(400, "Invalid operator_id")
 
-    auth_token = await FastJWT().decode(request.headers["Authorization"])
-    auth_token["id"] = PydanticObjectId(auth_token["id"])
+    initiator_membership = await validate_membership(principal, StaffLevel.ADMIN.value)
+    await validate_operator(operator, initiator_membership)
+
+    return await run_bulk(
+        "assign",
+        data,
+        lambda application: {
+            "template": "application_assigned",
+            "params": {"application_id": str(application.id)},
+        },
+        changes={"operator_id": PydanticObjectId(operator)},
+    )
 
-    initiator_membership = await validate_membership(
-        auth_token["id"], StaffLevel.OPERATOR.value
+
+@staff_application_router.patch("/bulk/deassign")
+async def bulk_deassign_applications(
+    data: BulkApplications, principal: Principal = Depends(login_required)
+):
+    await validate_membership(principal, StaffLevel.ADMIN.value)
+
+    return await run_bulk(
+        "deassign",
+        data,
+        lambda application: {
+            "template": "application_deassigned",
+            "params": {"application_id": str(application.id)},
+        },
+        changes={"operator_id": None},
     )
 
-    # check if operator have enough permissions
-    operator_membership = await StaffMembership.find_one(
-        {"user_id": PydanticObjectId(operator)}
+
+@staff_application_router.patch("/bulk/reject")
+async def bulk_reject_applications(
+    data: BulkReject, principal: Principal = Depends(login_required)
+):
+    await validate_membership(principal, StaffLevel.ADMIN.value)
+
+    return await run_bulk(
+        "reject",
+        data,
+        lambda application: {
+            "template": "application_status"
+            if data.message
+            else "application_status_no_message",
+            "params": {
+                "application_id": str(application.id),
+                "status": ApplicationStatus.REJECTED.value,
+                "message": data.message,
+            },
+        },
+        changes={"message": data.message} if data.message else None,
     )
-    if not operator_membership:
-        raise HTTPException(403, "Operator is not a staff member")
 
-    # check if operator level is lower than the initiator
-    if operator_membership.level.value > initiator_membership.value:
-        raise HTTPException(403, "You do not have enough permissions")
 
-    application = await ApplicationDoc.get(PydanticObjectId(application_id))
+# queue overview, shared by all admins for a few seconds
+@staff_application_router.get("/dashboard")
+async def get_dashboard(principal: Principal = Depends(login_required)):
+    await validate_membership(principal, StaffLevel.ADMIN.value)
 
-    if not application:
-        raise HTTPException(404, "Application not found")
+    return await queue_dashboard.get()
 
-    if application.status != ApplicationStatus.AWAITING_OPERATOR:
-        raise HTTPException(400, "Application already assigned")
 
-    application.operator_id = PydanticObjectId(operator)
-    application.status = ApplicationStatus.PENDING
+@staff_application_router.patch("/{application_id}/assign/{operator}")
+async def assign_application(
+    application_id: str, operator: str, principal: Principal = Depends(login_required)
+):
+    # check if application id and operator id are valid
+    if not PydanticObjectId.is_valid(application_id):
+        raise HTTPException(400, "Invalid application_id")
+    if not PydanticObjectId.is_valid(operator):
+        raise HTTPException(400, "Invalid operator_id")
 
-    await application.save()
+    initiator_membership = await validate_membership(
+        principal, StaffLevel.OPERATOR.value
+    )
+    await validate_operator(operator, initiator_membership)
 
-    await Notification(
-        user_id=str(application.user_id),
-        message=f"Application 'REF_{str(application.id)}' assigned to operator",
-        created_at=datetime.now(),
-    ).insert()
+    application = await transition(
+        PydanticObjectId(application_id),
+        "assign",
+        changes={"operator_id": PydanticObjectId(operator)},
+    )
+
+    await notification_outbox.put(
+        Notification(
+            user_id=str(application.user_id),
+            template="application_assigned",
+            params={"application_id": str(application.id)},
+            created_at=datetime.now(),
+        )
+    )
 
     return {
         "message": "Application assigned to operator",
@@ -79,55 +253,50 @@ async def assign_application(application_id: str, operator: str, request: Reques
 
 
 @staff_application_router.patch("/{application_id}/deassign")
-async def deassign_application(application_id: str, request: Request):
+async def deassign_application(
+    application_id: str, principal: Principal = Depends(login_required)
+):
     if not PydanticObjectId.is_valid(application_id):
         raise HTTPException(400, "Invalid application_id")
-    auth_token = await FastJWT().decode(request.headers["Authorization"])
-    auth_token["id"] = PydanticObjectId(auth_token["id"])
-    await validate_membership(auth_token["id"], StaffLevel.ADMIN.value)
-
-    application = await ApplicationDoc.get(PydanticObjectId(application_id))
+    await validate_membership(principal, StaffLevel.ADMIN.value)
 
-    if not application:
-        raise HTTPException(404, "Application not found")
-
-    if application.status != ApplicationStatus.PENDING:
-        raise HTTPException(400, "Application already processed")
-
-    application.operator_id = None
-    application.status = ApplicationStatus.AWAITING_OPERATOR
-
-    await application.save()
+    application = await transition(
+        PydanticObjectId(application_id), "deassign", changes={"operator_id": None}
+    )
 
-    await Notification(
-        user_id=str(application.user_id),
-        message=f"Application 'REF_{str(application.id)}' deassigned from operator",
-        created_at=datetime.now(),
-    ).insert()
+    await notification_outbox.put(
+        Notification(
+            user_id=str(application.user_id),
+            template="application_deassigned",
+            params={"application_id": str(application.id)},
+            created_at=datetime.now(),
+        )
+    )
 
     return {
         "message": "Application deassigned",
     }
 
 
-@staff_application_router.get("/assignments")
-async def get_assignments(request: Request):
-    auth_token = await FastJWT().decode(request.headers["Authorization"])
-    auth_token["id"] = PydanticObjectId(auth_token["id"])
-    await validate_membership(auth_token["id"], StaffLevel.JUNIOR_OPERATOR.value)
+@staff_application_router.get(
+    "/assignments",
+    response_model=Page[ApplicationDoc],
+    response_model_by_alias=False,
+)
+async def get_assignments(
+    page: PageParams = Depends(), principal: Principal = Depends(login_required)
+):
+    await validate_membership(principal, StaffLevel.JUNIOR_OPERATOR.value)
 
-    _applications = await ApplicationDoc.find(
+    _page = await paginate(
+        ApplicationDoc,
         {
-            "operator_id": auth_token["id"],
+            "operator_id": principal.id,
             "status": ApplicationStatus.PENDING,
-        }
-    ).to_list()
-    applications = []
-
-    for application in _applications:
-        applications.append(application.model_dump())
-
-    return applications
+        },
+        page,
+    )
+    return model_response(Page[ApplicationDoc](**_page), by_alias=False)
 
 
 # Aprove or reject application
@@ -135,7 +304,7 @@ async def get_assignments(request: Request):
 async def change_application_status(
     application_id: str,
     status: ApplicationStatus,
-    request: Request,
+    principal: Principal = Depends(login_required),
     message: ApplicationVerdictMessage = None,
 ):
     if not PydanticObjectId.is_valid(application_id):
@@ -143,31 +312,28 @@ async def change_application_status(
     if status not in [ApplicationStatus.APPROVED, ApplicationStatus.REJECTED]:
         raise HTTPException(400, "Invalid status")
 
-    auth_token = await FastJWT().decode(request.headers["Authorization"])
-    auth_token["id"] = PydanticObjectId(auth_token["id"])
-    await validate_membership(auth_token["id"], StaffLevel.ADMIN.value)
-
-    application = await ApplicationDoc.get(PydanticObjectId(application_id))
+    await validate_membership(principal, StaffLevel.ADMIN.value)
 
-    if not application:
-        raise HTTPException(404, "Application not found")
+    changes = {"message": message.message} if message else {}
 
-    if application.status == ApplicationStatus.AWAITING_DATA:
-        raise HTTPException(400, "Application is awaiting missing data")
+    if status == ApplicationStatus.REJECTED:
+        application = await transition(
+            PydanticObjectId(application_id), "reject", changes=changes
+        )
 
-    if application.status != ApplicationStatus.PENDING:
-        raise HTTPException(400, "Application already processed")
+    if status == ApplicationStatus.APPROVED:
+        application = await ApplicationDoc.get(PydanticObjectId(application_id))
 
-    if status == ApplicationStatus.REJECTED:
-        application.status = status
+        if not application:
+            raise HTTPException(404, "Application not found")
 
-        if message:
-            application.message = message.message
+        if application.status == ApplicationStatus.AWAITING_DATA:
+            raise HTTPException(409, "Application is awaiting missing data")
 
-        await application.save()
+        if application.status != ApplicationStatus.PENDING:
+            raise HTTPException(409, "Application already processed")
 
-    if status == ApplicationStatus.APPROVED:
-        service_document = await ServiceDocument.get(application.service_document_id)
+        service_document = await service_catalog.get(application.service_document_id)
 
         missing_data = []
 
@@ -180,14 +346,27 @@ async def change_application_status(
                 400, f"Application is missing data, approving is not possible!"
             )
 
-        application.status = status
-
-        if message:
-            application.message = message.message
+        # build the public card now, so a broken document is never issued
+        apex_doc_id = PydanticObjectId()
+        try:
+            public_card = PublicCard.build(
+                apex_doc_id, service_document.name, application.data
+            )
+        except (KeyError, TypeError, ValidationError):
+            raise HTTPException(
+                400, "Application data can not produce a verifiable document"
+            )
 
-        await application.save()
+        # the checked data must still be the stored one
+        application = await transition(
+            application.id,
+            "approve",
+            changes=changes,
+            modified_at=application.modified_at,
+        )
 
         apex_doc = await ApexDocument(
+            id=apex_doc_id,
             user_id=application.user_id,
             application_id=application.id,
             data=application.data,
@@ -195,21 +374,37 @@ async def change_application_status(
             metadata={
                 "application_id": str(application.id),
             },
+            public_card=public_card,
             created_at=datetime.now(),
             updated_at=datetime.now(),
         ).insert()
 
-        await Notification(
+        await notification_outbox.put(
+            Notification(
+                user_id=str(application.user_id),
+                template="document_issued",
+                params={
+                    "service_name": service_document.name,
+                    "document_id": str(apex_doc.id),
+                },
+                created_at=datetime.now(),
+            )
+        )
+
+    await notification_outbox.put(
+        Notification(
             user_id=str(application.user_id),
-            message=f"Congratulations! Your application for '{service_document.name}' is approved. Your 'DOC_{str(apex_doc.id)}' is ready.",
+            template="application_status"
+            if message
+            else "application_status_no_message",
+            params={
+                "application_id": str(application.id),
+                "status": status.value,
+                "message": message.message if message else None,
+            },
             created_at=datetime.now(),
-        ).insert()
-
-    await Notification(
-        user_id=str(application.user_id),
-        message=f"Application 'REF_{str(application.id)}' is {status.value}. Message: '{message.message if message else 'Has no message from operator'}'",
-        created_at=datetime.now(),
-    ).insert()
+        )
+    )
 
     return {
         "message": "Application status changed",
@@ -218,12 +413,12 @@ async def change_application_status(
 
 # analyze application and the service document and return the expected result
 @staff_application_router.get("/{application_id}/analyze")
-async def analyze_application(application_id: str, request: Request):
+async def analyze_application(
+    application_id: str, principal: Principal = Depends(login_required)
+):
     if not PydanticObjectId.is_valid(application_id):
         raise HTTPException(400, "Invalid application_id")
-    auth_token = await FastJWT().decode(request.headers["Authorization"])
-    auth_token["id"] = PydanticObjectId(auth_token["id"])
-    await validate_membership(auth_token["id"], StaffLevel.JUNIOR_OPERATOR.value)
+    await validate_membership(principal, StaffLevel.JUNIOR_OPERATOR.value)
 
     application = await ApplicationDoc.get(PydanticObjectId(application_id))
 
@@ -231,10 +426,10 @@ async def analyze_application(application_id: str, request: Request):
         raise HTTPException(404, "Application not found")
 
     # check if application operator is the same as the current user
-    if application.operator_id != auth_token["id"]:
+    if application.operator_id != principal.id:
         raise HTTPException(403, "You are not assigned to this application")
 
-    service_document = await ServiceDocument.get(application.service_document_id)
+    service_document = await service_catalog.get(application.service_document_id)
 
     # compare application data with service document data
     missing_fields = []
@@ -256,41 +451,53 @@ async def analyze_application(application_id: str, request: Request):
 # set application field value
 @staff_application_router.patch("/{application_id}/data")
 async def set_application_data(
-    application_id: str, field: str, value: str, request: Request
+    application_id: str,
+    field: str,
+    value: str,
+    principal: Principal = Depends(login_required),
 ):
     if not PydanticObjectId.is_valid(application_id):
         raise HTTPException(400, "Invalid application_id")
     if not field or not value:
         raise HTTPException(400, "Invalid field or value")
-    auth_token = await FastJWT().decode(request.headers["Authorization"])
-    auth_token["id"] = PydanticObjectId(auth_token["id"])
-    await validate_membership(auth_token["id"], StaffLevel.OPERATOR.value)
+    await validate_membership(principal, StaffLevel.OPERATOR.value)
 
     application = await ApplicationDoc.get(PydanticObjectId(application_id))
 
-    service_document = await ServiceDocument.get(application.service_document_id)
-
     if not application:
         raise HTTPException(404, "Application not found")
 
     # check if application operator is the same as the current user
-    if application.operator_id != auth_token["id"]:
+    if application.operator_id != principal.id:
         raise HTTPException(403, "You are not assigned to this application")
 
-    if field not in service_document.required_fields:
+    required_fields = await service_catalog.required_fields(
+        application.service_document_id
+    )
+    if field not in required_fields:
         raise HTTPException(
             400, "Field do not exist in service document required fields"
         )
 
-    application.data[field] = value
+    # only the one field, a concurrent transition is left intact
+    result = await ApplicationDoc.find_one(
+        {"_id": application.id, "operator_id": principal.id}
+    ).update({"$set": {f"data.{field}": value, "modified_at": datetime.now()}})
+    if not result.matched_count:
+        raise HTTPException(409, "Application was changed meanwhile, try again")
 
-    await application.save()
-
-    await Notification(
-        user_id=str(application.user_id),
-        message=f"Application 'REF_{str(application.id)}' data updated. Field: {field} Value: {value}",
-        created_at=datetime.now(),
-    ).insert()
+    await notification_outbox.put(
+        Notification(
+            user_id=str(application.user_id),
+            template="application_data_updated",
+            params={
+                "application_id": str(application.id),
+                "field": field,
+                "value": value,
+            },
+            created_at=datetime.now(),
+        )
+    )
 
     return {
         "message": "Application data updated",
@@ -299,24 +506,24 @@ async def set_application_data(
 
 # request missing application data
 @staff_application_router.get("/{application_id}/request_data")
-async def request_missing_data(application_id: str, request: Request):
+async def request_missing_data(
+    application_id: str, principal: Principal = Depends(login_required)
+):
     if not PydanticObjectId.is_valid(application_id):
         raise HTTPException(400, "Invalid application_id")
-    auth_token = await FastJWT().decode(request.headers["Authorization"])
-    auth_token["id"] = PydanticObjectId(auth_token["id"])
-    await validate_membership(auth_token["id"], StaffLevel.JUNIOR_OPERATOR.value)
+    await validate_membership(principal, StaffLevel.JUNIOR_OPERATOR.value)
 
     application = await ApplicationDoc.get(PydanticObjectId(application_id))
 
-    service_document = await ServiceDocument.get(application.service_document_id)
-
     if not application:
         raise HTTPException(404, "Application not found")
 
     # check if application operator is the same as the current user
-    if application.operator_id != auth_token["id"]:
+    if application.operator_id != principal.id:
         raise HTTPException(403, "You are not assigned to this application")
 
+    service_document = await service_catalog.get(application.service_document_id)
+
     missing_fields = []
     for field in service_document.required_fields:
         if field not in application.data:
@@ -325,15 +532,24 @@ async def request_missing_data(application_id: str, request: Request):
     if not missing_fields:
         raise HTTPException(400, "No missing fields")
 
-    application.status = ApplicationStatus.AWAITING_DATA
-
-    await application.save()
+    await transition(
+        application.id,
+        "request_data",
+        filters={"operator_id": principal.id},
+        modified_at=application.modified_at,
+    )
 
-    await Notification(
-        user_id=str(application.user_id),
-        message=f"Please fill the missing fields in the application 'REF_{application.id}' data: {' '.join(missing_fields)}",
-        created_at=datetime.now(),
-    ).insert()
+    await notification_outbox.put(
+        Notification(
+            user_id=str(application.user_id),
+            template="application_missing_data",
+            params={
+                "application_id": str(application.id),
+                "missing_fields": " ".join(missing_fields),
+            },
+            created_at=datetime.now(),
+        )
+    )
 
     return {
         "message": "Missing fields requested sent to user notifications",
@@ -343,35 +559,42 @@ async def request_missing_data(application_id: str, request: Request):
 
 # get user profile by application id
 @staff_application_router.get("/{application_id}/user")
-async def get_user_by_application_id(application_id: str, request: Request):
+async def get_user_by_application_id(
+    application_id: str, principal: Principal = Depends(login_required)
+):
     if not PydanticObjectId.is_valid(application_id):
         raise HTTPException(400, "Invalid application_id")
-    auth_token = await FastJWT().decode(request.headers["Authorization"])
-    auth_token["id"] = PydanticObjectId(auth_token["id"])
-    await validate_membership(auth_token["id"], StaffLevel.STAFF.value)
+    await validate_membership(principal, StaffLevel.STAFF.value)
 
-    application = await ApplicationDoc.get(PydanticObjectId(application_id))
+    application = await ApplicationDoc.find_one(
+        {"_id": PydanticObjectId(application_id)}, projection_model=ApplicationState
+    )
 
     if not application:
         raise HTTPException(404, "Application not found")
 
-    user = await UserDoc.get(application.user_id)
+    user = await UserDoc.find_one(
+        {"_id": application.user_id}, projection_model=UserView
+    )
 
-    del user.password
+    if not user:
+        raise HTTPException(404, "User not found")
 
     return user.model_dump()
 
 
 # get user documents by application id
 @staff_application_router.get("/{application_id}/documents")
-async def get_user_documents_by_application_id(application_id: str, request: Request):
+async def get_user_documents_by_application_id(
+    application_id: str, principal: Principal = Depends(login_required)
+):
     if not PydanticObjectId.is_valid(application_id):
         raise HTTPException(400, "Invalid application_id")
-    auth_token = await FastJWT().decode(request.headers["Authorization"])
-    auth_token["id"] = PydanticObjectId(auth_token["id"])
-    await validate_membership(auth_token["id"], StaffLevel.STAFF.value)
+    await validate_membership(principal, StaffLevel.STAFF.value)
 
-    application = await ApplicationDoc.get(PydanticObjectId(application_id))
+    application = await ApplicationDoc.find_one(
+        {"_id": PydanticObjectId(application_id)}, projection_model=ApplicationState
+    )
 
     if not application:
         raise HTTPException(404, "Application not found")
@@ -379,3 +602,24 @@ async def get_user_documents_by_application_id(application_id: str, request: Req
     documents = await ApexDocument.find({"user_id": application.user_id}).to_list()
 
     return documents
+
+
+# get one application with its data
+@staff_application_router.get(
+    "/{application_id}",
+    response_model=ApplicationDoc,
+    response_model_by_alias=False,
+)
+async def get_application(
+    application_id: str, principal: Principal = Depends(login_required)
+):
+    if not PydanticObjectId.is_valid(application_id):
+        raise HTTPException(400, "Invalid application_id")
+    await validate_membership(principal, StaffLevel.STAFF.value)
+
+    application = await ApplicationDoc.get(PydanticObjectId(application_id))
+
+    if not application:
+        raise HTTPException(404, "Application not found")
+
+    return model_response(application, by_alias=False)
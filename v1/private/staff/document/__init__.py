@@ -1,6 +1,8 @@
 from beanie import PydanticObjectId
-from fastapi import APIRouter, Depends, HTTPException, Request
-from app.core.fastjwt import FastJWT
+from fastapi import APIRouter, Depends, HTTPException
+from app.core.fastjwt import login_required
+from app.core.principal import Principal
+from app.core.service_catalog import service_catalog
 from app.core.validate_membership import validate_membership
 from v1.models.application import ApplicationDoc
 from v1.models.user import StaffLevel
@@ -13,28 +15,29 @@ document_router = APIRouter(prefix="/document")
 
 
 @document_router.post("/create")
-async def create_service_document(request: Request, payload: NewServiceDocument):
-    auth_token = await FastJWT().decode(request.headers["Authorization"])
-    auth_token["id"] = PydanticObjectId(auth_token["id"])
-    await validate_membership(auth_token["id"], StaffLevel.ADMIN.value)
+async def create_service_document(
+    payload: NewServiceDocument, principal: Principal = Depends(login_required)
+):
+    await validate_membership(principal, StaffLevel.ADMIN.value)
 
     service_document = await ServiceDocument(
         **payload.model_dump(),
         created_at=datetime.now(),
         updated_at=datetime.now(),
     ).insert()
+    service_catalog.add(service_document)
 
     return service_document.model_dump()
 
 
 # get user application by application id
 @document_router.get("/{document_id}/application")
-async def get_application_by_document_id(document_id: str, request: Request):
+async def get_application_by_document_id(
+    document_id: str, principal: Principal = Depends(login_required)
+):
     if not PydanticObjectId.is_valid(document_id):
         raise HTTPException(400, "Invalid document_id")
-    auth_token = await FastJWT().decode(request.headers["Authorization"])
-    auth_token["id"] = PydanticObjectId(auth_token["id"])
-    await validate_membership(auth_token["id"], StaffLevel.STAFF.value)
+    await validate_membership(principal, StaffLevel.STAFF.value)
 
     document = await ApexDocument.get(PydanticObjectId(document_id))
 
@@ -1,10 +1,13 @@
 from datetime import datetime
 from fastapi import APIRouter, Depends, HTTPException, Request
 from app.core.fastjwt import FastJWT
+from app.core.session_cache import session_cache
 from v1.models.authorized_device import AuthorizedDevice
 from v1.schemas.user import GeneralUserID, AuthorizarionSchema
 from v1.models.user import UserDoc
-from app.core.password import hash_password
+from app.core.password import password_hasher
+from app.core.rate_limit import signin_throttle
+from app.core.notification_outbox import notification_outbox
 from v1.models.notification import Notification
 
 
@@ -18,7 +21,7 @@ async def signup_event(payload: GeneralUserID, request: Request):
         raise HTTPException(status_code=400, detail="User already exists")
 
     # Encrypt the password
-    payload.password = hash_password(payload.password)
+    payload.password = await password_hasher.hash(payload.password)
 
     user = UserDoc(
         **payload.model_dump(),
@@ -28,11 +31,11 @@ async def signup_event(payload: GeneralUserID, request: Request):
 
     notification = Notification(
         user_id=user.id,
-        message="Welcome to the platform",
+        template="welcome",
         created_at=datetime.now(),
     )
 
-    await notification.insert()
+    await notification_outbox.put(notification)
 
     return {
         "message": "User created successfully",
@@ -40,23 +43,30 @@ async def signup_event(payload: GeneralUserID, request: Request):
 
 
 @authorization_router.post("/signin")
-async def signin_event(payload: AuthorizarionSchema):
-    payload.password = hash_password(payload.password)
+async def signin_event(payload: AuthorizarionSchema, request: Request):
+    client_ip = request.client.host if request.client else "unknown"
+    await signin_throttle.check(payload.email, client_ip)
 
-    user = await UserDoc.find_one(
-        {"email": payload.email, "password": payload.password}
-    )
+    user = await UserDoc.find_one({"email": payload.email})
 
     if not user:
+        # hash anyway so unknown emails take as long as wrong passwords
+        await password_hasher.hash(payload.password)
+
+    if not user or not await password_hasher.verify(payload.password, user.password):
+        await signin_throttle.record_failure(payload.email, client_ip)
         raise HTTPException(
             status_code=400, detail="User not found or password is incorrect"
         )
 
+    await signin_throttle.record_success(payload.email, client_ip)
+
     authorized_device = await AuthorizedDevice(
         user_id=user.id,
         metadata=payload.metadata,
         created_at=datetime.now(),
     ).save()
+    session_cache.add_device(authorized_device)
 
     jwt_token = await FastJWT().encode(
         optional_data={
@@ -66,11 +76,14 @@ async def signin_event(payload: AuthorizarionSchema):
         }
     )
 
-    await Notification(
-        user_id=user.id,
-        message=f"New device signed in to your account, DeviceID: {str(authorized_device.id)}",
-        created_at=datetime.now(),
-    ).insert()
+    await notification_outbox.put(
+        Notification(
+            user_id=user.id,
+            template="device_signed_in",
+            params={"device_id": str(authorized_device.id)},
+            created_at=datetime.now(),
+        )
+    )
 
     return {
         "message": "User signed in successfully",
@@ -1,6 +1,8 @@
 from fastapi import APIRouter, Depends, HTTPException, Request
 import datetime
-from v1.models.document import ApexDocument, ConfrimationToken, ServiceDocument
+from app.core.document_token import build_public_card, document_token_signer
+from v1.models.document import ApexDocument, ConfrimationToken
+from v1.schemas.document import PublicCardView
 from beanie import PydanticObjectId
 import re
 
@@ -8,32 +10,38 @@ document_router = APIRouter(prefix="/document")
 
 
 async def delete_confirmation_token(token: str):
-    await ConfrimationToken.find_one({"_id": PydanticObjectId(token)}).delete()
+    await ConfrimationToken.find_one({"token": PydanticObjectId(token)}).delete()
 
 
 # get document by confirmation token
 @document_router.get("/verify/{token}")
 async def get_document_by_token(token: str):
+    # signed tokens carry the card themselves, no database access needed
+    if re.match(r"^[\w-]+\.[\w-]+\.[\w-]+$", token):
+        return document_token_signer.verify(token).model_dump()
+
     if not re.match(r"^[a-f\d]{24}$", token):
         raise HTTPException(
             status_code=400,
             detail="Invalid token",
         )
-    _token = await ConfrimationToken.find_one({"_id": PydanticObjectId(token)})
+    _token = await ConfrimationToken.find_one({"token": PydanticObjectId(token)})
     if not _token:
         raise HTTPException(
             status_code=404,
             detail="Document is invalid",
         )
 
-    if _token.expire_at < datetime.datetime.now():
-        await delete_confirmation_token(token)
+    # expired tokens are left to the TTL index
+    if _token.expire_at < datetime.datetime.utcnow():
         raise HTTPException(
             status_code=400,
             detail="Token expired",
         )
 
-    _document = await ApexDocument.get(_token.document_id)
+    _document = await ApexDocument.find_one(
+        {"_id": _token.document_id}, projection_model=PublicCardView
+    )
     if not _document:
         # TODO: report suspicious activity
         await delete_confirmation_token(token)
@@ -42,17 +50,11 @@ async def get_document_by_token(token: str):
             detail="Document is invalid",
         )
 
-    _service_document = await ServiceDocument.get(_document.service_id)
-
-    try:
-        _public_data = {
-            "document_name": _service_document.name,
-            "DOB": _document.data["born"]["date"],
-            "document_id": str(_document.id),
-            "first_name": _document.data["first_name"],
-            "last_name": _document.data["last_name"],
-        }
-    except:
+    # documents issued before cards were stored need the full read
+    _public_card = _document.public_card or await build_public_card(
+        await ApexDocument.get(_token.document_id)
+    )
+    if not _public_card:
         # TODO: report broken document
         await delete_confirmation_token(token)
         raise HTTPException(
@@ -60,4 +62,16 @@ async def get_document_by_token(token: str):
             detail="Document is invalid",
         )
 
-    return _public_data
+    return _public_card.model_dump()
+
+
+# public key of signed confirmation tokens, for offline verification
+@document_router.get("/verification-key")
+async def get_verification_key():
+    if not document_token_signer.enabled:
+        raise HTTPException(
+            status_code=404,
+            detail="Signed confirmation tokens are disabled",
+        )
+
+    return document_token_signer.jwks()
@@ -1,8 +1,12 @@
+from datetime import datetime
 from typing import Optional
-from pydantic import BaseModel, validator
+from beanie import PydanticObjectId
+from pydantic import BaseModel, Field, model_validator, validator
+from app.core.config import settings
 from app.core.email_fixer import EmailFixer
 import re
 
+from v1.models.application import ApplicationStatus
 from v1.schemas.user import UserDetails
 
 
@@ -43,3 +47,73 @@ class Application(BaseModel):
 
 class ApplicationVerdictMessage(BaseModel):
     message: Optional[str] = None
+
+
+class CabinetItem(BaseModel):
+    id: PydanticObjectId = Field(alias="_id")
+    service_document_id: PydanticObjectId
+    status: ApplicationStatus
+    created_at: datetime
+
+
+class ApplicationListItem(BaseModel):
+    """An application without its data, for staff listings"""
+
+    id: PydanticObjectId = Field(alias="_id")
+    operator_id: Optional[PydanticObjectId] = None
+    user_id: PydanticObjectId
+    service_document_id: PydanticObjectId
+    status: ApplicationStatus
+    message: Optional[str] = None
+    created_at: datetime
+    modified_at: datetime
+
+
+class ApplicationState(BaseModel):
+    id: PydanticObjectId = Field(alias="_id")
+    user_id: PydanticObjectId
+    status: ApplicationStatus
+    modified_at: datetime
+
+
+class BulkApplicationFilter(BaseModel):
+    status: Optional[ApplicationStatus] = None
+    service_document_id: Optional[PydanticObjectId] = None
+    operator_id: Optional[PydanticObjectId] = None
+    created_before: Optional[datetime] = None
+
+    def query(self) -> dict:
+        query = {}
+        if self.status:
+            query["status"] = self.status.value
+        if self.service_document_id:
+            query["service_document_id"] = self.service_document_id
+        if self.operator_id:
+            query["operator_id"] = self.operator_id
+        if self.created_before:
+            query["created_at"] = {"$lt": self.created_before}
+        return query
+
+
+class BulkApplications(BaseModel):
+    """Either explicit ids or a filter, matching oldest first"""
+
+    ids: Optional[list[PydanticObjectId]] = None
+    filter: Optional[BulkApplicationFilter] = None
+
+    @model_validator(mode="after")
+    def check_target(self) -> "BulkApplications":
+        if (self.ids is None) == (self.filter is None):
+            raise ValueError("Provide either ids or filter")
+        if self.ids is not None:
+            if not self.ids:
+                raise ValueError("ids is empty")
+            if len(self.ids) > settings.APPLICATION_BULK_MAX_ITEMS:
+                raise ValueError(
+                    f"At most {settings.APPLICATION_BULK_MAX_ITEMS} ids per request"
+                )
+        return self
+
+
+class BulkReject(BulkApplications):
+    message: Optional[str] = None
@@ -7,3 +7,28 @@ class NewServiceDocument(BaseModel):
     description: str
     required_fields: list[str]
     metadata: Optional[dict] = {}
+
+
+class PublicCard(BaseModel):
+    """Part of an ApexDocument shown to relying parties on verification"""
+
+    document_name: str
+    DOB: str
+    document_id: str
+    first_name: str
+    last_name: str
+
+    @classmethod
+    def build(cls, document_id, document_name: str, data: dict) -> "PublicCard":
+        """Raises KeyError, TypeError or ValidationError on broken data"""
+        return cls(
+            document_name=document_name,
+            DOB=data["born"]["date"],
+            document_id=str(document_id),
+            first_name=data["first_name"],
+            last_name=data["last_name"],
+        )
+
+
+class PublicCardView(BaseModel):
+    public_card: Optional[PublicCard] = None
@@ -0,0 +1,31 @@
+from datetime import datetime
+from typing import Optional
+from beanie import PydanticObjectId
+from pydantic import BaseModel, Field, model_validator
+
+from app.core.notification_templates import render
+
+
+class MarkRead(BaseModel):
+    # all unread notifications when omitted
+    ids: Optional[list[PydanticObjectId]] = None
+
+
+class NotificationView(BaseModel):
+    """A notification as shown to its user, with the message rendered"""
+
+    id: PydanticObjectId = Field(alias="_id")
+    user_id: PydanticObjectId
+    message: Optional[str] = None
+    template: Optional[str] = Field(None, exclude=True)
+    params: dict = Field({}, exclude=True)
+    created_at: datetime
+    created_by: Optional[str] = "system"
+    metadata: Optional[dict] = {}
+    read_at: Optional[datetime] = None
+
+    @model_validator(mode="after")
+    def render_message(self) -> "NotificationView":
+        if self.template:
+            self.message = render(self.template, self.params) or self.message
+        return self
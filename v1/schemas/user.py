@@ -1,5 +1,6 @@
 from typing import Optional
-from pydantic import BaseModel
+from beanie import PydanticObjectId
+from pydantic import BaseModel, Field
 
 
 class BirthData(BaseModel):
@@ -30,3 +31,22 @@ class AuthorizarionSchema(BaseModel):
     email: str
     password: str
     metadata: Optional[dict] = {}
+
+
+class ProfileView(BaseModel):
+    id: PydanticObjectId
+    first_name: str
+
+
+class UserView(BaseModel):
+    """A user as shown to staff, everything but the password hash"""
+
+    id: PydanticObjectId = Field(alias="_id")
+    email: str
+    first_name: str
+    last_name: str
+    gender: str
+    born: BirthData
+    phone_number: str
+    nationality: str
+    metadata: dict = {}